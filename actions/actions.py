@@ -1,26 +1,162 @@
-from typing import Any, Text, Dict, List
+import asyncio
+from abc import ABCMeta, abstractmethod
+import functools
+import logging
+import os
+from typing import Any, Text, Dict, List, Optional
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet, AllSlotsReset
 from rasa_sdk.forms import FormValidationAction
 from rasa_sdk.types import DomainDict
-from .recommendation_engine import RecommendationEngine
+from . import startup
+from .recommendation_engine import get_engine
 from .utils import format_list, format_courses
 from .db import Database
-
-recommendation_engine = RecommendationEngine()
+from .write_behind import WriteBehindBuffer
+from .cache import ReadThroughCache, VersionedCache
+from .offload import call_engine, offload, run_limited
+from .catalog_watcher import watcher_stats
+from .metrics import instrument, record_timeout, register_stats, start_metrics_server
+from .profiling import profiled
+from .taxonomy import SenderCache
+from .validation import profile_validator
+
+startup.checkpoint("imports")
+
+# One per action-server process; the catalog indexes are shared read-only by every action.
+# They are built by the warm-up thread started below, or by the first action that needs them.
+recommendation_engine = get_engine()
 db = Database()
+# Profile saves are buffered and written in batches off the validation path
+profile_writer = WriteBehindBuffer(db)
+
+# Conversations are bursts of turns from one sender, so stored profiles are cached per sender_id
+profile_cache = ReadThroughCache(maxsize=int(os.getenv("PROFILE_CACHE_SIZE", "10000")),
+                                 ttl=float(os.getenv("PROFILE_CACHE_TTL", "300")))
+
+# Skills, interests and target_domain mapped to canonical names, remembered per sender_id
+normalized_profiles = SenderCache(maxsize=int(os.getenv("PROFILE_CACHE_SIZE", "10000")),
+                                  ttl=float(os.getenv("PROFILE_CACHE_TTL", "300")))
+
+# Rendered recommendation messages; emptied automatically when the catalog version changes
+response_cache = VersionedCache(lambda: recommendation_engine.version,
+                                maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "4096")))
+
+# Cache, write-behind and catalog reload counters are read at scrape time; /metrics runs on METRICS_PORT
+register_stats("profile_cache", profile_cache.stats)
+register_stats("response_cache", response_cache.stats)
+register_stats("taxonomy_cache", normalized_profiles.stats)
+register_stats("profile_writer", profile_writer.stats)
+register_stats("catalog_watcher", watcher_stats)
+register_stats("startup", startup.stats)
+if startup.serving_process():
+    start_metrics_server()
+    startup.start_warm_up(recommendation_engine)
+
+logger = logging.getLogger(__name__)
+
+# Slots persisted to the profile store
+PROFILE_SLOTS = ("name", "degree", "semester", "gpa", "skills", "time_commitment",
+                 "interests", "learning_goal", "target_domain")
+
+async def _fetch_profile(sender_id: Text) -> Dict[Text, Any]:
+    profile = await db.get_profile(sender_id)
+    # Saves still waiting in the write-behind buffer are newer than the database
+    pending = profile_writer.pending_profile(sender_id)
+    return {**profile, **pending} if pending else profile
+
+async def load_profile(tracker: Tracker) -> Dict[Text, Any]:
+    """The user's profile: current slots, falling back to the stored profile for unset ones.
+
+    Skills, interests and target_domain come back as canonical names ("ml" -> "AI").
+    """
+    try:
+        stored = await profile_cache.get_or_load(tracker.sender_id, _fetch_profile)
+    except Exception:
+        logger.exception("Could not load stored profile for %s", tracker.sender_id)
+        stored = {}
+    profile = dict(stored)
+    for slot in PROFILE_SLOTS:
+        value = tracker.get_slot(slot)
+        if value is not None:
+            profile[slot] = value
+    return normalized_profiles.normalize_profile(tracker.sender_id, profile)
+
+async def forget_profile(sender_id: Text):
+    """Delete the stored profile along with any unsaved or cached copy, so a reset stays reset."""
+    try:
+        await profile_writer.delete(sender_id)
+    except Exception:
+        logger.exception("Could not delete stored profile for %s", sender_id)
+    # Invalidated after the delete so a load that raced with it cannot cache the old row
+    profile_cache.invalidate(sender_id)
+    normalized_profiles.invalidate(sender_id)
+
+def ranking_features(profile: Dict[Text, Any]) -> Dict[Text, Any]:
+    """Profile fields used to personalize recommendation ranking."""
+    return {
+        "skills": profile.get("skills") or [],
+        "interests": profile.get("interests") or [],
+        "learning_goal": profile.get("learning_goal") or "",
+    }
+
+def requested_level(tracker: Tracker) -> Optional[Text]:
+    """Course level asked for in the latest message (the skill_level entity, e.g. "beginner"), if any."""
+    level = next(tracker.get_latest_entity_values("skill_level"), None)
+    return (str(level).strip() or None) if level else None
+
+def response_key(action: Text, domain: Text, level: Any, features: Dict[Text, Any]) -> tuple:
+    """Cache key for a rendered recommendation: the action, domain, level and normalized ranking features."""
+    def norm(values):
+        if isinstance(values, (list, tuple)):
+            return tuple(sorted(str(v).strip().lower() for v in values))
+        return str(values or "").strip().lower()
+    return (action, domain.strip().lower(), norm(level) if level else None,
+            norm(features["skills"]), norm(features["interests"]), norm(features["learning_goal"]))
+
+class GuardedAction(Action, metaclass=ABCMeta):
+    """Action whose work runs under the shared concurrency limit and ACTION_TIMEOUT.
+
+    Subclasses implement `respond`; if it does not finish in time the user
+    gets `degraded_text` instead of a conversation that hangs.
+    """
+
+    degraded_text = "Sorry, that is taking longer than expected. Please try again in a moment."
+
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        try:
+            return await run_limited(functools.partial(self.respond, dispatcher, tracker, domain))
+        except asyncio.TimeoutError:
+            logger.warning("%s timed out for %s; sending degraded answer", self.name(), tracker.sender_id)
+            record_timeout(self.name())
+            dispatcher.utter_message(text=self.degraded_text)
+            return []
+
+    @abstractmethod
+    async def respond(self, dispatcher: CollectingDispatcher,
+                      tracker: Tracker,
+                      domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        """Send the action's messages and return its events; runs under the limit and timeout of `run`."""
+        ...
+
+@instrument
+@profiled
+class ActionRecommendLearningPath(GuardedAction):
+    degraded_text = "I'm taking longer than usual to build your learning path. Please ask again in a moment."
 
-class ActionRecommendLearningPath(Action):
     def name(self) -> Text:
         return "action_recommend_learning_path"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def respond(self, dispatcher: CollectingDispatcher,
+                      tracker: Tracker,
+                      domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
-        target_domain = tracker.get_slot("target_domain")
-        interests = tracker.get_slot("interests")
+        profile = await load_profile(tracker)
+        target_domain = profile.get("target_domain")
+        interests = profile.get("interests")
         # Fallback: if target_domain is not set, use most recent interest
         if not target_domain and interests:
             target_domain = interests[-1]
@@ -30,88 +166,18 @@ class ActionRecommendLearningPath(Action):
             return []
 
         # Collect additional profile information to personalize timeline
-        degree = tracker.get_slot("degree")
-        semester = tracker.get_slot("semester")
-        gpa = tracker.get_slot("gpa")
-        skills = tracker.get_slot("skills") or []
-        time_commitment = tracker.get_slot("time_commitment") or "1 hour"
-        learning_goal = tracker.get_slot("learning_goal") or ""
-
-        # Base path (short string) from recommendation engine
-        base_path = recommendation_engine.get_learning_path(target_domain)
-
-        # Parse time commitment (hours per day)
-        import re
-        hours_per_day = 1.0
-        m = re.search(r"(\d+(?:\.\d+)?)", str(time_commitment))
-        if m:
-            try:
-                hours_per_day = float(m.group(1))
-            except Exception:
-                hours_per_day = 1.0
-
-        # Difficulty scaling: more hours -> faster progress
-        if hours_per_day < 0.75:
-            speed_factor = 1.8
-        elif hours_per_day < 1.5:
-            speed_factor = 1.2
-        elif hours_per_day < 3:
-            speed_factor = 1.0
-        else:
-            speed_factor = 0.8
-
-        # Split the base path into stages
-        stages = [s.strip() for s in base_path.split('->')]
-
-        # If user already lists Python, remove Python stage entirely
-        has_python = any('python' in (s or '').lower() for s in skills)
-        if has_python:
-            stages = [s for s in stages if 'python' not in s.lower()]
-
-        # Assign estimated weeks per stage (base) and adjust by speed and existing skills
-        base_weeks = {
-            'python': 2,
-            'math for ml': 4,
-            'basic ml algorithms': 6,
-            'deep learning': 10,
-            'nlp/cv': 8,
-            'html/css': 2,
-            'javascript': 4,
-            'react/vue': 6,
-            'node.js': 6,
-            'databases': 4,
-            'devops': 6,
-            'networking basics': 3,
-            'linux': 3,
-            'scripting (python/bash)': 4,
-            'ethical hacking': 6,
-            'cloud security': 6
-        }
-
-        timeline_lines = []
-        total_weeks = 0
-        for stage in stages:
-            key = stage.lower()
-            # normalize common variations
-            key = key.replace('.', '').replace('  ', ' ').strip()
-            weeks = None
-            # try to match keywords
-            for k in base_weeks:
-                if k in key:
-                    weeks = base_weeks[k]
-                    break
-            if weeks is None:
-                # fallback default
-                weeks = 6
-
-            # reduce python time if user already knows python
-            if 'python' in key and has_python:
-                weeks = max(1, int(weeks * 0.5))
-
-            # adjust by speed factor
-            adj_weeks = max(1, int(weeks * speed_factor))
-            total_weeks += adj_weeks
-            timeline_lines.append(f"{stage}: ~{adj_weeks} week(s)")
+        degree = profile.get("degree")
+        semester = profile.get("semester")
+        gpa = profile.get("gpa")
+        skills = profile.get("skills") or []
+        time_commitment = profile.get("time_commitment") or "1 hour"
+        learning_goal = profile.get("learning_goal") or ""
+
+        # Stage order and per-stage estimates come precompiled from the planner; this is a
+        # lookup, so unlike ranking it is cheaper inline than a hop to the worker pool
+        plan = recommendation_engine.plan_learning_path(target_domain, time_commitment, skills)
+        timeline_lines = [f"{stage}: ~{weeks} week(s)" for stage, weeks in plan.stages]
+        total_weeks = plan.total_weeks
 
         # Build a helpful explanation
         header = f"Here is a recommended learning path for {target_domain} based on your profile:\n"
@@ -123,25 +189,31 @@ class ActionRecommendLearningPath(Action):
 
         actionable = "Tips:\n- Practice by building small projects after each stage.\n- Use curated courses (Coursera, fast.ai, Udemy) and official docs.\n- Pair learning with hands-on projects and version control (Git).\n"
 
-        # Build display path from final stages (after any filtering)
-        display_path = ' -> '.join(stages)
-
-        message = header + profile_summary + goal_line + "Path: " + (display_path or base_path) + "\n\nTimeline:\n" + timeline_text + timeline_note + "\n" + actionable
+        # Display path from final stages (after any filtering)
+        display_path = plan.display_path or recommendation_engine.get_learning_path(target_domain)
 
-        dispatcher.utter_message(text=message)
+        # Sent as separate chat messages; the action server still returns all three in one response
+        dispatcher.utter_message(text=header + profile_summary + goal_line + "Path: " + display_path)
+        dispatcher.utter_message(text="Timeline:\n" + timeline_text + timeline_note)
+        dispatcher.utter_message(text=actionable)
 
         return []
 
-class ActionRecommendCourses(Action):
+@instrument
+@profiled
+class ActionRecommendCourses(GuardedAction):
+    degraded_text = "I'm taking longer than usual to rank courses. Meanwhile, Coursera and Udemy are good places to start."
+
     def name(self) -> Text:
         return "action_recommend_courses"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def respond(self, dispatcher: CollectingDispatcher,
+                      tracker: Tracker,
+                      domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
-        target_domain = tracker.get_slot("target_domain")
-        interests = tracker.get_slot("interests")
+        profile = await load_profile(tracker)
+        target_domain = profile.get("target_domain")
+        interests = profile.get("interests")
         
         if not target_domain and interests:
             target_domain = interests[-1]
@@ -150,25 +222,37 @@ class ActionRecommendCourses(Action):
             dispatcher.utter_message(text="Please specify a domain for course recommendations (e.g., AI, Web Development).")
             return []
 
-        courses = recommendation_engine.recommend_courses(target_domain)
-        if courses:
-            formatted_courses = format_courses(courses)
-            dispatcher.utter_message(text=f"Here are some recommended courses for {target_domain}:\n{formatted_courses}")
-        else:
-            dispatcher.utter_message(text=f"I couldn't find specific courses for {target_domain}, but I suggest checking Coursera or Udemy.")
+        features = ranking_features(profile)
+        level = requested_level(tracker)
+        key = response_key(self.name(), target_domain, level, features)
+        text = response_cache.get(key)
+        if text is None:
+            courses = await offload(call_engine, "recommend_courses", target_domain, level, profile=features)
+            if courses:
+                formatted_courses = format_courses(courses)
+                text = f"Here are some recommended courses for {target_domain}:\n{formatted_courses}"
+            else:
+                text = f"I couldn't find specific courses for {target_domain}, but I suggest checking Coursera or Udemy."
+            response_cache.set(key, text)
+        dispatcher.utter_message(text=text)
 
         return []
 
-class ActionRecommendProjects(Action):
+@instrument
+@profiled
+class ActionRecommendProjects(GuardedAction):
+    degraded_text = "I'm taking longer than usual to pick project ideas. A simple To-Do App or Calculator is always a good start."
+
     def name(self) -> Text:
         return "action_recommend_projects"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def respond(self, dispatcher: CollectingDispatcher,
+                      tracker: Tracker,
+                      domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
-        target_domain = tracker.get_slot("target_domain")
-        interests = tracker.get_slot("interests")
+        profile = await load_profile(tracker)
+        target_domain = profile.get("target_domain")
+        interests = profile.get("interests")
         
         if not target_domain and interests:
             target_domain = interests[-1]
@@ -177,22 +261,33 @@ class ActionRecommendProjects(Action):
             dispatcher.utter_message(text="I need to know your domain to suggest projects.")
             return []
 
-        projects = recommendation_engine.recommend_projects(target_domain)
-        formatted_projects = format_list(projects)
-        dispatcher.utter_message(text=f"Here are some project ideas for {target_domain}:\n{formatted_projects}")
+        features = ranking_features(profile)
+        key = response_key(self.name(), target_domain, None, features)
+        text = response_cache.get(key)
+        if text is None:
+            projects = await offload(call_engine, "recommend_projects", target_domain, profile=features)
+            formatted_projects = format_list(projects)
+            text = f"Here are some project ideas for {target_domain}:\n{formatted_projects}"
+            response_cache.set(key, text)
+        dispatcher.utter_message(text=text)
 
         return []
 
-class ActionRecommendCareer(Action):
+@instrument
+@profiled
+class ActionRecommendCareer(GuardedAction):
+    degraded_text = "I'm taking longer than usual to look up career paths. Please ask again in a moment."
+
     def name(self) -> Text:
         return "action_recommend_career"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def respond(self, dispatcher: CollectingDispatcher,
+                      tracker: Tracker,
+                      domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
-        target_domain = tracker.get_slot("target_domain")
-        interests = tracker.get_slot("interests")
+        profile = await load_profile(tracker)
+        target_domain = profile.get("target_domain")
+        interests = profile.get("interests")
         
         if not target_domain and interests:
             target_domain = interests[-1]
@@ -201,12 +296,20 @@ class ActionRecommendCareer(Action):
             dispatcher.utter_message(text="I need to know your domain to give career guidance.")
             return []
 
-        careers = recommendation_engine.recommend_career(target_domain)
-        formatted_careers = format_list(careers)
-        dispatcher.utter_message(text=f"Here are some career paths in {target_domain}:\n{formatted_careers}")
+        features = ranking_features(profile)
+        key = response_key(self.name(), target_domain, None, features)
+        text = response_cache.get(key)
+        if text is None:
+            careers = await offload(call_engine, "recommend_career", target_domain, profile=features)
+            formatted_careers = format_list(careers)
+            text = f"Here are some career paths in {target_domain}:\n{formatted_careers}"
+            response_cache.set(key, text)
+        dispatcher.utter_message(text=text)
 
         return []
 
+@instrument
+@profiled
 class ActionShowProfile(Action):
     def name(self) -> Text:
         return "action_show_profile"
@@ -225,150 +328,97 @@ class ActionShowProfile(Action):
         dispatcher.utter_message(text=profile_text)
         return []
 
+@instrument
+@profiled
 class ActionResetAllSlots(Action):
     def name(self) -> Text:
         return "action_reset_all_slots"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        await forget_profile(tracker.sender_id)
         return [AllSlotsReset()]
 
+@instrument
+@profiled
 class ActionGreet(Action):
     def name(self) -> Text:
         return "action_greet"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        # Greeting starts a fresh profile; without this load_profile would bring the old one back
+        await forget_profile(tracker.sender_id)
         dispatcher.utter_message(response="utter_greet")
         return [AllSlotsReset()]
 
 
+@instrument
+@profiled
 class ValidateProfileForm(FormValidationAction):
     def name(self) -> Text:
         return "validate_profile_form"
 
-    async def validate_degree(self,
-                              slot_value: Any,
-                              dispatcher: CollectingDispatcher,
-                              tracker: Tracker,
-                              domain: DomainDict,) -> Dict[Text, Any]:
-        if slot_value and isinstance(slot_value, str) and len(slot_value) > 1:
-            return {"degree": slot_value}
-        dispatcher.utter_message(text="I didn't get your degree clearly. Which degree are you pursuing?")
-        return {"degree": None}
-
-    async def validate_semester(self,
-                                slot_value: Any,
-                                dispatcher: CollectingDispatcher,
-                                tracker: Tracker,
-                                domain: DomainDict,) -> Dict[Text, Any]:
-        import re
-
-        # Accept numbers, ordinals (5th), or numeric words if simple digits present
-        if slot_value is None:
-            dispatcher.utter_message(text="Please provide your semester as a number, e.g. 5")
-            return {"semester": None}
-
-        text = str(slot_value).lower().strip()
-
-        # Try to find a number in the text (e.g., '5', '5th')
-        m = re.search(r"(\d{1,2})", text)
-        if m:
-            try:
-                sem = int(m.group(1))
-                if 1 <= sem <= 12:
-                    return {"semester": str(sem)}
-            except Exception:
-                pass
-
-        # fallback: map some common words
-        words_to_num = {
-            'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-            'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
-            'eleven': 11, 'twelve': 12
-        }
-        for word, num in words_to_num.items():
-            if word in text:
-                return {"semester": str(num)}
-
-        dispatcher.utter_message(text="Please provide your semester as a number (for example: 5 or '5th').")
-        return {"semester": None}
-
-    async def validate_gpa(self,
-                           slot_value: Any,
-                           dispatcher: CollectingDispatcher,
-                           tracker: Tracker,
-                           domain: DomainDict,) -> Dict[Text, Any]:
-        try:
-            g = float(slot_value)
-            # accept 0-10 or 0-4, normalize to string
-            if 0.0 <= g <= 10.0:
-                return {"gpa": str(g)}
-        except Exception:
-            pass
-        dispatcher.utter_message(text="Please provide your GPA as a number (for example: 3.5 or 7.2).")
-        return {"gpa": None}
-
-    async def validate_skills(self,
-                              slot_value: Any,
-                              dispatcher: CollectingDispatcher,
-                              tracker: Tracker,
-                              domain: DomainDict,) -> Dict[Text, Any]:
-        # normalize skills into a list
-        if not slot_value:
-            dispatcher.utter_message(text="Please list at least one technical skill you have.")
-            return {"skills": None}
-        if isinstance(slot_value, list):
-            skills_list = slot_value
-        else:
-            skills_list = [s.strip() for s in str(slot_value).replace(';', ',').split(',') if s.strip()]
-        return {"skills": skills_list}
-
-    async def validate_time_commitment(self,
-                                       slot_value: Any,
-                                       dispatcher: CollectingDispatcher,
-                                       tracker: Tracker,
-                                       domain: DomainDict,) -> Dict[Text, Any]:
-        if slot_value:
-            return {"time_commitment": str(slot_value)}
-        dispatcher.utter_message(text="How much time can you commit to learning daily? (e.g., 1 hour)")
-        return {"time_commitment": None}
-
-    async def validate_interests(self,
-                                 slot_value: Any,
-                                 dispatcher: CollectingDispatcher,
-                                 tracker: Tracker,
-                                 domain: DomainDict,) -> Dict[Text, Any]:
-        if not slot_value:
-            dispatcher.utter_message(text="What are your areas of interest? (e.g., AI, Web Development)")
-            return {"interests": None}
-        if isinstance(slot_value, list):
-            interests_list = slot_value
-        else:
-            # Parse as comma-separated or single item
-            text = str(slot_value).strip()
-            if ',' in text:
-                interests_list = [s.strip() for s in text.split(',') if s.strip()]
-            else:
-                interests_list = [text]
-        
-        # Ensure we have at least one valid interest
-        if interests_list and len(interests_list) > 0:
-            return {"interests": interests_list}
-        
-        dispatcher.utter_message(text="What are your areas of interest? (e.g., AI, Web Development)")
-        return {"interests": None}
-
-    async def validate_learning_goal(self,
-                                     slot_value: Any,
-                                     dispatcher: CollectingDispatcher,
-                                     tracker: Tracker,
-                                     domain: DomainDict,) -> Dict[Text, Any]:
-        # Accept any non-empty string for learning goal
-        if slot_value and len(str(slot_value).strip()) > 0:
-            return {"learning_goal": str(slot_value).strip()}
-        dispatcher.utter_message(text="Please tell me your learning goal (e.g., 'Learn AI', 'Become a web developer')")
-        return {"learning_goal": None}
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: DomainDict) -> List[Dict[Text, Any]]:
+        events = await super().run(dispatcher, tracker, domain)
+
+        # Persist the validated profile slots so they outlive the conversation
+        profile = {e["name"]: e["value"] for e in events
+                   if e.get("event") == "slot" and e.get("name") in PROFILE_SLOTS and e.get("value") is not None}
+        if profile:
+            profile_cache.invalidate(tracker.sender_id)
+            await profile_writer.put(tracker.sender_id, profile)
+        return events
+
+    async def get_validation_events(self, dispatcher: CollectingDispatcher,
+                                    tracker: Tracker,
+                                    domain: DomainDict) -> List[Dict[Text, Any]]:
+        # Every slot this message filled is checked in one pass over the rule table,
+        # instead of one validate_<slot> coroutine per slot
+        required = await self.required_slots(self.domain_slots(domain), dispatcher, tracker, domain)
+        slots = {name: value for name, value in tracker.slots_to_validate().items() if name in required}
+        values, messages = profile_validator.validate(slots)
+        for text in messages:
+            dispatcher.utter_message(text=text)
+        tracker.slots.update(values)
+        return [SlotSet(name, value) for name, value in values.items()]
+
+    # Per-slot entry points, kept for callers that validate one slot at a time
+    def _validate(self, slot: Text, slot_value: Any, dispatcher: CollectingDispatcher) -> Dict[Text, Any]:
+        value, message = profile_validator.validate_slot(slot, slot_value)
+        if message:
+            dispatcher.utter_message(text=message)
+        return {slot: value}
+
+    async def validate_degree(self, slot_value: Any, dispatcher: CollectingDispatcher,
+                              tracker: Tracker, domain: DomainDict) -> Dict[Text, Any]:
+        return self._validate("degree", slot_value, dispatcher)
+
+    async def validate_semester(self, slot_value: Any, dispatcher: CollectingDispatcher,
+                                tracker: Tracker, domain: DomainDict) -> Dict[Text, Any]:
+        return self._validate("semester", slot_value, dispatcher)
+
+    async def validate_gpa(self, slot_value: Any, dispatcher: CollectingDispatcher,
+                           tracker: Tracker, domain: DomainDict) -> Dict[Text, Any]:
+        return self._validate("gpa", slot_value, dispatcher)
+
+    async def validate_skills(self, slot_value: Any, dispatcher: CollectingDispatcher,
+                              tracker: Tracker, domain: DomainDict) -> Dict[Text, Any]:
+        return self._validate("skills", slot_value, dispatcher)
+
+    async def validate_time_commitment(self, slot_value: Any, dispatcher: CollectingDispatcher,
+                                       tracker: Tracker, domain: DomainDict) -> Dict[Text, Any]:
+        return self._validate("time_commitment", slot_value, dispatcher)
+
+    async def validate_interests(self, slot_value: Any, dispatcher: CollectingDispatcher,
+                                 tracker: Tracker, domain: DomainDict) -> Dict[Text, Any]:
+        return self._validate("interests", slot_value, dispatcher)
+
+    async def validate_learning_goal(self, slot_value: Any, dispatcher: CollectingDispatcher,
+                                     tracker: Tracker, domain: DomainDict) -> Dict[Text, Any]:
+        return self._validate("learning_goal", slot_value, dispatcher)
 
@@ -0,0 +1,174 @@
+"""Batch recommendations for whole cohorts, outside the chatbot.
+
+Reads student profiles from a CSV file, plans each one's learning path and
+ranks courses, projects and careers with the same RecommendationEngine the
+action server uses, and writes one JSON object per profile (JSONL) in input
+order:
+
+    python -m actions.batch cohort.csv -o paths.jsonl --workers 8
+
+CSV columns match the profile slots: id (or sender_id), name, degree,
+semester, gpa, skills, time_commitment, interests, learning_goal and
+target_domain. Only target_domain or interests is required; list columns are
+split on "," or ";". Skills, interests and target_domain are mapped to
+canonical names as in the chatbot ("ml" -> "AI"). Use "-" to read stdin or
+write stdout.
+
+Profiles are read, processed and written in chunks, with at most
+`workers * 2` chunks in flight, so memory stays flat however large the
+input. The engine is built once in the parent; forked workers share it.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .catalog import load_catalog
+from .recommendation_engine import RecommendationEngine
+from .taxonomy import normalize_profile
+
+LIST_FIELDS = ("skills", "interests")
+_LIST_SEPARATORS = re.compile(r"[;,]")
+
+# Set in the parent before the pool forks, or by the worker initializer under spawn
+_engine: Optional[RecommendationEngine] = None
+
+
+def _init_worker(catalog_path: Optional[str]):
+    global _engine
+    if _engine is None:
+        _engine = RecommendationEngine(load_catalog(catalog_path))
+
+
+def parse_profile(row: Dict[str, str]) -> Dict[str, Any]:
+    """A CSV row as a profile: blank cells dropped, list columns split."""
+    profile: Dict[str, Any] = {}
+    for key, value in row.items():
+        if key is None or value is None:
+            continue
+        key, value = key.strip().lower(), value.strip()
+        if not value:
+            continue
+        if key in LIST_FIELDS:
+            profile[key] = [v.strip() for v in _LIST_SEPARATORS.split(value) if v.strip()]
+        else:
+            profile[key] = value
+    return profile
+
+
+def recommend(engine: RecommendationEngine, profile: Dict[str, Any], top: int = 5) -> Dict[str, Any]:
+    """Learning path, courses, projects and careers for one profile, as the chatbot would give them."""
+    profile = normalize_profile(profile)
+    interests = profile.get("interests") or []
+    # Same fallback as the recommendation actions: the most recent interest
+    target_domain = profile.get("target_domain") or (interests[-1] if interests else None)
+    result: Dict[str, Any] = {"id": profile.get("id") or profile.get("sender_id")}
+    if not target_domain:
+        result["error"] = "no target_domain or interests"
+        return result
+
+    skills = profile.get("skills") or []
+    time_commitment = profile.get("time_commitment") or "1 hour"
+    features = {"skills": skills, "interests": interests, "learning_goal": profile.get("learning_goal") or ""}
+    plan = engine.plan_learning_path(target_domain, time_commitment, skills)
+    result.update({
+        "target_domain": target_domain,
+        "time_commitment": time_commitment,
+        "path": plan.display_path or engine.get_learning_path(target_domain),
+        "stages": [{"stage": stage, "weeks": weeks} for stage, weeks in plan.stages],
+        "total_weeks": plan.total_weeks,
+        "courses": [dict(c) for c in engine.recommend_courses(target_domain, profile=features, k=top)],
+        "projects": engine.recommend_projects(target_domain, features),
+        "careers": engine.recommend_career(target_domain, features),
+    })
+    return result
+
+
+def process_chunk(rows: List[Dict[str, str]], top: int) -> List[str]:
+    """Worker entry point: one JSON line per row. A bad row yields an error line, not a failed chunk."""
+    lines = []
+    for row in rows:
+        profile = parse_profile(row)
+        try:
+            result = recommend(_engine, profile, top)
+        except Exception as e:
+            result = {"id": profile.get("id") or profile.get("sender_id"), "error": f"{type(e).__name__}: {e}"}
+        lines.append(json.dumps(result, ensure_ascii=False))
+    return lines
+
+
+def _chunks(rows: Iterable[Dict[str, str]], size: int) -> Iterator[List[Dict[str, str]]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(rows: Iterable[Dict[str, str]], out: TextIO, workers: int, chunk_size: int = 64,
+        top: int = 5, catalog_path: Optional[str] = None) -> int:
+    """Process `rows` and write JSON lines to `out` in input order; returns the number of profiles."""
+    _init_worker(catalog_path)
+    written = 0
+    if workers <= 0:
+        for chunk in _chunks(rows, chunk_size):
+            for line in process_chunk(chunk, top):
+                out.write(line + "\n")
+            written += len(chunk)
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(catalog_path,)) as pool:
+        # Bounded window of in-flight chunks, drained oldest first so output keeps input order
+        pending: "deque[Future]" = deque()
+        for chunk in _chunks(rows, chunk_size):
+            if len(pending) >= workers * 2:
+                lines = pending.popleft().result()
+                out.write("\n".join(lines) + "\n")
+                written += len(lines)
+            pending.append(pool.submit(process_chunk, chunk, top))
+        while pending:
+            lines = pending.popleft().result()
+            out.write("\n".join(lines) + "\n")
+            written += len(lines)
+    return written
+
+
+# ============================================================================
+# Command line
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m actions.batch", description=__doc__.split("\n")[0])
+    parser.add_argument("input", help='CSV file of profiles ("-" for stdin)')
+    parser.add_argument("-o", "--output", default="-", help='JSONL output file (default "-" for stdout)')
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count; 0 runs in this process)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="profiles per task sent to a worker")
+    parser.add_argument("--top", type=int, default=5, help="courses per profile (default 5)")
+    parser.add_argument("--catalog", help="catalog to use instead of CATALOG_PATH")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        count = run(csv.DictReader(source), out, args.workers, args.chunk_size, args.top, args.catalog)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {count} profiles in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f}/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
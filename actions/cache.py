@@ -0,0 +1,166 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded LRU cache with an optional per-entry TTL (seconds).
+
+    Not thread-safe; meant to be used from the action server's event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires = entry
+            if expires is None or expires > self._clock():
+                self._data.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return value
+            del self._data[key]
+            self.expirations += 1
+        if count:
+            self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any):
+        expires = self._clock() + self.ttl if self.ttl else None
+        self._data[key] = (value, expires)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "miss_ratio": self.misses / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_UNSEEN = object()
+
+
+class VersionedCache(LRUCache):
+    """LRU cache tied to a data version: it empties itself when `version()` changes.
+
+    Used for values derived from the catalog, so a catalog reload invalidates
+    everything rendered from the old one without any explicit hook.
+    """
+
+    def __init__(self, version: Callable[[], Hashable], maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(maxsize, ttl, clock)
+        self._version = version
+        # Read on first use, so creating the cache does not force the data to load
+        self._seen_version: Any = _UNSEEN
+        self.invalidations = 0
+
+    def _check_version(self):
+        current = self._version()
+        if current != self._seen_version:
+            if self._seen_version is not _UNSEEN:
+                self.clear()
+                self.invalidations += 1
+            self._seen_version = current
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        self._check_version()
+        return super().get(key, default, count)
+
+    def set(self, key: Hashable, value: Any):
+        self._check_version()
+        super().set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["invalidations"] = self.invalidations
+        return stats
+
+
+class ReadThroughCache(LRUCache):
+    """LRU/TTL cache that loads missing keys with an async loader.
+
+    Concurrent misses for the same key share a single load. Invalidating a
+    key while its load is in flight discards that load's result, so a value
+    read before a write is never cached after it.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(maxsize, ttl, clock)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.loads = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[Hashable], Awaitable[Any]]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = future
+        # shield: one caller being cancelled must not cancel the shared load
+        return await asyncio.shield(future)
+
+    async def _load(self, key: Hashable, loader: Callable[[Hashable], Awaitable[Any]]) -> Any:
+        self.loads += 1
+        try:
+            value = await loader(key)
+        except BaseException:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+            raise
+        if self._inflight.get(key) is asyncio.current_task():
+            del self._inflight[key]
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        super().invalidate(key)
+        self._inflight.pop(key, None)
+
+    def clear(self):
+        super().clear()
+        self._inflight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["loads"] = self.loads
+        stats["inflight"] = len(self._inflight)
+        return stats
@@ -0,0 +1,311 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import itertools
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(__file__), "data", "catalog.json")
+# When set, a JSON/JSONL/SQLite catalog is compiled once into a memory-mapped .bin snapshot here
+# (see catalog_bin) and later starts map that snapshot instead of parsing and indexing again
+SNAPSHOT_DIR = os.getenv("CATALOG_SNAPSHOT_DIR")
+
+# Item kinds stored in a catalog file. Each kind gets its own set of indexes.
+KINDS = ("course", "project", "career")
+
+# Fields we build inverted indexes for. "tags" is multi-valued.
+INDEXED_FIELDS = ("domain", "level", "platform", "tags")
+
+
+# Every Catalog instance gets a new version, so caches derived from it can tell a reload happened
+_versions = itertools.count(1)
+
+
+def _norm(value: Any) -> str:
+    return str(value).strip().casefold()
+
+
+class Catalog:
+    """Immutable in-memory catalog with inverted indexes.
+
+    Items are plain dicts (title, domain, level, platform, tags) and must be
+    treated as read-only by callers: the same objects are shared by every
+    action in the process. Each index maps a normalized value to a tuple of
+    item ids, so a filtered lookup only touches the matching items.
+    """
+
+    def __init__(self, items: Iterable[Dict[str, Any]], learning_paths: Optional[Dict[str, Any]] = None):
+        self.version = next(_versions)
+        self.items: Tuple[Dict[str, Any], ...] = tuple(items)
+        self.learning_paths: Dict[str, Any] = dict(learning_paths or {})
+
+        index: Dict[Tuple[str, str], Dict[str, List[int]]] = {}
+        by_domain_level: Dict[Tuple[str, str, str], List[int]] = {}
+        by_kind: Dict[str, List[int]] = {}
+        domain_names: Dict[str, str] = {}
+
+        for item_id, item in enumerate(self.items):
+            kind = item.get("kind", "course")
+            by_kind.setdefault(kind, []).append(item_id)
+            for field in INDEXED_FIELDS:
+                values = item.get(field)
+                if values is None:
+                    continue
+                if field != "tags":
+                    values = [values]
+                postings = index.setdefault((kind, field), {})
+                for value in values:
+                    postings.setdefault(_norm(value), []).append(item_id)
+            if item.get("domain"):
+                domain_names.setdefault(_norm(item["domain"]), item["domain"])
+                if item.get("level"):
+                    key = (kind, _norm(item["domain"]), _norm(item["level"]))
+                    by_domain_level.setdefault(key, []).append(item_id)
+
+        for domain in self.learning_paths:
+            domain_names.setdefault(_norm(domain), domain)
+
+        # Freeze posting lists so they can be shared safely
+        self._index = {k: {v: tuple(ids) for v, ids in postings.items()} for k, postings in index.items()}
+        self._by_domain_level = {k: tuple(ids) for k, ids in by_domain_level.items()}
+        self._by_kind = {k: tuple(ids) for k, ids in by_kind.items()}
+        self._domain_names = domain_names
+        self._learning_paths = {_norm(k): v for k, v in self.learning_paths.items()}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def domains(self) -> List[str]:
+        return list(self._domain_names.values())
+
+    def canonical_domain(self, domain: str) -> Optional[str]:
+        """Return the domain name as spelled in the catalog, or None if unknown."""
+        if not domain:
+            return None
+        return self._domain_names.get(_norm(domain))
+
+    def learning_path(self, domain: str) -> Any:
+        """Raw learning path spec for the domain (see planner.LearningPathPlanner), or None."""
+        if not domain:
+            return None
+        return self._learning_paths.get(_norm(domain))
+
+    def ids_of_kind(self, kind: str) -> Sequence[int]:
+        return self._by_kind.get(kind, ())
+
+    def postings(self, kind: str, field: str, value: str) -> Sequence[int]:
+        return self._index.get((kind, field), {}).get(_norm(value), ())
+
+    def domain_level_ids(self, kind: str, domain: str, level: str) -> Sequence[int]:
+        return self._by_domain_level.get((kind, _norm(domain), _norm(level)), ())
+
+    def query(self, kind: str = "course", limit: Optional[int] = None, **filters: Optional[str]) -> List[Dict[str, Any]]:
+        """Return items of `kind` matching every non-empty filter (see `query_ids`)."""
+        return [self.items[i] for i in self.query_ids(kind, limit, **filters)]
+
+    def query_ids(self, kind: str = "course", limit: Optional[int] = None, **filters: Optional[str]) -> List[int]:
+        """Return ids of items of `kind` matching every non-empty filter, in catalog order.
+
+        Supported filters are the INDEXED_FIELDS, with `tag` accepted as an
+        alias for `tags`. The smallest posting list drives the lookup and the
+        remaining filters are checked per candidate.
+        """
+        filters = {("tags" if k == "tag" else k): v for k, v in filters.items() if v}
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported catalog filter(s): {', '.join(sorted(unknown))}")
+
+        if not filters:
+            candidates = self.ids_of_kind(kind)
+        elif "domain" in filters and "level" in filters:
+            candidates = self.domain_level_ids(kind, filters["domain"], filters["level"])
+            filters = {k: v for k, v in filters.items() if k not in ("domain", "level")}
+        else:
+            candidates = None
+
+        lists = [(f, self.postings(kind, f, v)) for f, v in filters.items()]
+        if candidates is None:
+            lists.sort(key=lambda pair: len(pair[1]))
+            _, candidates = lists.pop(0)
+        rest = [(f, _norm(filters[f])) for f, _ in lists]
+        if not rest:
+            # The index answered every filter; no per-item checks needed
+            return list(candidates[:limit] if limit is not None else candidates)
+
+        results = []
+        for item_id in candidates:
+            if all(self._matches(self.items[item_id], f, v) for f, v in rest):
+                results.append(item_id)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    @staticmethod
+    def _matches(item: Dict[str, Any], field: str, value: str) -> bool:
+        if field == "tags":
+            return any(_norm(t) == value for t in item.get("tags") or ())
+        return _norm(item.get(field, "")) == value
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+def _items_from_document(doc: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    for key, kind in (("courses", "course"), ("projects", "project"), ("careers", "career")):
+        for item in doc.get(key, []):
+            yield dict(item, kind=item.get("kind", kind))
+    for item in doc.get("items", []):
+        yield dict(item)
+
+
+# Each reader returns (items, learning_paths) so several files can be merged into one catalog
+
+def _read_json(path: str):
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    return list(_items_from_document(doc)), doc.get("learning_paths") or {}
+
+
+def _read_jsonl(path: str):
+    # One item per line; a line with a "learning_path" key describes a domain path instead
+    items, paths = [], {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "learning_path" in record:
+                paths[record["domain"]] = record["learning_path"]
+            else:
+                items.append(record)
+    return items, paths
+
+
+def _read_sqlite(path: str):
+    # Expected schema:
+    #   items(kind TEXT, title TEXT, domain TEXT, level TEXT, platform TEXT, tags TEXT)  -- tags is comma separated
+    #   learning_paths(domain TEXT, path TEXT)  -- "A -> B" or a JSON stage graph
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        items = []
+        for kind, title, domain, level, platform, tags in conn.execute(
+                "SELECT kind, title, domain, level, platform, tags FROM items ORDER BY rowid"):
+            item = {"kind": kind or "course", "title": title, "domain": domain}
+            if level:
+                item["level"] = level
+            if platform:
+                item["platform"] = platform
+            item["tags"] = [t.strip() for t in (tags or "").split(",") if t.strip()]
+            items.append(item)
+        # A path is either a linear "A -> B" string or a JSON stage graph
+        paths = {domain: (json.loads(path) if path.lstrip().startswith("{") else path)
+                 for domain, path in conn.execute("SELECT domain, path FROM learning_paths")}
+    finally:
+        conn.close()
+    return items, paths
+
+
+_READERS = {
+    ".json": _read_json,
+    ".jsonl": _read_jsonl,
+    ".db": _read_sqlite,
+    ".sqlite": _read_sqlite,
+    ".sqlite3": _read_sqlite,
+}
+
+
+def catalog_path() -> str:
+    return os.getenv("CATALOG_PATH", DEFAULT_CATALOG_PATH)
+
+
+def catalog_files(path: str) -> List[str]:
+    """The catalog file itself, or every supported file in a catalog directory (sorted by name)."""
+    if not os.path.isdir(path):
+        return [path]
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))
+            if os.path.splitext(name)[1].lower() in _READERS]
+
+
+def catalog_signature(path: Optional[str] = None) -> Tuple:
+    """Cheap fingerprint (name, mtime, size) of the catalog source, used to detect changes."""
+    signature = []
+    for file in catalog_files(path or catalog_path()):
+        try:
+            st = os.stat(file)
+        except FileNotFoundError:
+            continue
+        signature.append((file, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def load_catalog(path: Optional[str] = None) -> Catalog:
+    """Load a catalog from a .json, .jsonl or SQLite (.db/.sqlite) file, or a directory of them.
+
+    A compiled `.bin` catalog (see catalog_bin) is memory-mapped instead of parsed.
+    """
+    path = path or catalog_path()
+    if os.path.splitext(path)[1].lower() == ".bin":
+        from .catalog_bin import MappedCatalog
+
+        return MappedCatalog(path)
+    if SNAPSHOT_DIR:
+        return _load_snapshot(path)
+    return _parse_catalog(path)
+
+
+def _parse_catalog(path: str) -> Catalog:
+    items, paths = [], {}
+    for file in catalog_files(path):
+        reader = _READERS.get(os.path.splitext(file)[1].lower(), _read_json)
+        file_items, file_paths = reader(file)
+        items.extend(file_items)
+        paths.update(file_paths)
+    return Catalog(items, paths)
+
+
+def _load_snapshot(path: str) -> Catalog:
+    """Map the compiled snapshot of `path` from SNAPSHOT_DIR, compiling it first if the source changed."""
+    from .catalog_bin import MappedCatalog, build
+
+    digest = hashlib.sha1(repr(catalog_signature(path)).encode("utf-8")).hexdigest()[:16]
+    snapshot = os.path.join(SNAPSHOT_DIR, f"catalog-{digest}.bin")
+    if os.path.exists(snapshot):
+        try:
+            return MappedCatalog(snapshot)
+        except Exception:
+            logger.exception("Catalog snapshot %s is unreadable; rebuilding it", snapshot)
+
+    catalog = _parse_catalog(path)
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        # Written under a temporary name and renamed, so a concurrent starter never maps half a file
+        partial = f"{snapshot}.{os.getpid()}.tmp"
+        build(catalog, partial)
+        os.replace(partial, snapshot)
+        for name in os.listdir(SNAPSHOT_DIR):
+            if name.startswith("catalog-") and name.endswith(".bin") and name != os.path.basename(snapshot):
+                os.remove(os.path.join(SNAPSHOT_DIR, name))
+        return MappedCatalog(snapshot)
+    except Exception:
+        logger.exception("Could not write catalog snapshot to %s; using the parsed catalog", SNAPSHOT_DIR)
+        return catalog
+
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """Return the process-wide catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+    return _catalog
@@ -0,0 +1,291 @@
+"""Compact, memory-mapped catalog format.
+
+A compiled catalog is one little-endian file made of 8-byte aligned sections:
+
+    header    magic, section count, then (name, offset, length) per section
+    strofs    u32[n + 1] offsets into strblob (the string table)
+    strblob   UTF-8 bytes of every distinct string
+    records   u32[n_items * 7]: kind, title, domain, level, platform, tags_start, tags_count
+    tags      u32 string ids referenced by records
+    keys      u32[n_keys * 5]: kind, field, value, postings_start, postings_count
+    postings  u32 item ids, one run per index key
+    paths     learning paths as JSON (small)
+    <kind>.*  prebuilt TF-IDF arrays per item kind (ids, vocab, idf, indptr, indices, data)
+
+Record fields and index values are string ids; NONE marks a missing field.
+Opening a catalog maps the file and only decodes the small index key table,
+so forked action-server workers share the bulk of it through the page cache.
+
+Build one with:
+
+    python -m actions.catalog_bin build actions/data/catalog.json catalog.bin
+
+and point CATALOG_PATH at the result.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, Tuple
+
+from .catalog import KINDS, Catalog, _norm, _versions, load_catalog
+from .ranking import TfidfRanker, item_terms
+from .startup import lazy_import
+
+np = lazy_import("numpy")
+
+MAGIC = b"PLACAT01"
+NONE = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<8sI4x")
+_SECTION = struct.Struct("<16sQQ")
+_RECORD_WIDTH = 7
+_KEY_WIDTH = 5
+
+# Index field codes stored in the keys section
+FIELDS = ("domain", "level", "platform", "tags", "domain_level", "kind")
+_FIELD_CODES = {name: code for code, name in enumerate(FIELDS)}
+_RANKER_ARRAYS = (("ids", "int64"), ("vocab", "uint32"), ("idf", "float32"),
+                  ("indptr", "int64"), ("indices", "int32"), ("data", "float32"))
+
+
+# ============================================================================
+# Build
+# ============================================================================
+
+class _Strings:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return sid
+
+
+def build(catalog: Catalog, out_path: str):
+    """Compile `catalog` into `out_path`, replacing any existing file atomically."""
+    strings = _Strings()
+    records = np.empty(len(catalog.items) * _RECORD_WIDTH, dtype=np.uint32)
+    tags: List[int] = []
+    index: Dict[Tuple[int, int, int], List[int]] = {}
+
+    def post(kind_sid, field, value, item_id):
+        index.setdefault((kind_sid, _FIELD_CODES[field], strings.add(value)), []).append(item_id)
+
+    for item_id, item in enumerate(catalog.items):
+        kind = item.get("kind", "course")
+        kind_sid = strings.add(kind)
+        item_tags = [strings.add(t) for t in item.get("tags") or ()]
+        base = item_id * _RECORD_WIDTH
+        records[base:base + _RECORD_WIDTH] = (
+            kind_sid, strings.add(item.get("title")), strings.add(item.get("domain")),
+            strings.add(item.get("level")), strings.add(item.get("platform")), len(tags), len(item_tags))
+        tags.extend(item_tags)
+
+        post(kind_sid, "kind", kind, item_id)
+        for field in ("domain", "level", "platform"):
+            if item.get(field) is not None:
+                post(kind_sid, field, _norm(item[field]), item_id)
+        for tag in item.get("tags") or ():
+            post(kind_sid, "tags", _norm(tag), item_id)
+        if item.get("domain") and item.get("level"):
+            post(kind_sid, "domain_level", _norm(item["domain"]) + "\x1f" + _norm(item["level"]), item_id)
+
+    keys, postings = [], []
+    for (kind_sid, field, value_sid), ids in index.items():
+        keys.extend((kind_sid, field, value_sid, len(postings), len(ids)))
+        postings.extend(ids)
+
+    sections = [
+        ("records", records.tobytes()),
+        ("tags", np.asarray(tags, dtype=np.uint32).tobytes()),
+        ("keys", np.asarray(keys, dtype=np.uint32).tobytes()),
+        ("postings", np.asarray(postings, dtype=np.uint32).tobytes()),
+        ("paths", json.dumps(catalog.learning_paths).encode("utf-8")),
+    ]
+
+    # Precompute the TF-IDF rankers so opening the file does no tokenizing
+    for kind in KINDS:
+        ids = catalog.ids_of_kind(kind)
+        ranker = TfidfRanker(ids, (item_terms(catalog.items[i]) for i in ids))
+        vocab = np.empty(len(ranker.vocab), dtype=np.uint32)
+        for term, col in ranker.vocab.items():
+            vocab[col] = strings.add(term)
+        arrays = {"ids": ranker.ids, "vocab": vocab, "idf": ranker.idf,
+                  "indptr": ranker.indptr, "indices": ranker.indices, "data": ranker.data}
+        for name, dtype in _RANKER_ARRAYS:
+            sections.append((f"{kind}.{name}", np.ascontiguousarray(arrays[name], dtype=dtype).tobytes()))
+
+    encoded = [s.encode("utf-8") for s in strings.values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    sections = [("strofs", offsets.tobytes()), ("strblob", b"".join(encoded))] + sections
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        header_size = _HEADER.size + _SECTION.size * len(sections)
+        offset = _align(header_size)
+        table = []
+        for name, data in sections:
+            table.append((name, offset, len(data)))
+            offset = _align(offset + len(data))
+        f.write(_HEADER.pack(MAGIC, len(sections)))
+        for name, start, length in table:
+            f.write(_SECTION.pack(name.encode("ascii"), start, length))
+        for (name, start, length), (_, data) in zip(table, sections):
+            f.seek(start)
+            f.write(data)
+        f.truncate(_align(offset))
+    # Readers that already mapped the old file keep its inode until they close it
+    os.replace(tmp_path, out_path)
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+# ============================================================================
+# Read
+# ============================================================================
+
+class _MappedItems(Sequence):
+    """Read-only sequence view of the records section; items are decoded on access."""
+
+    def __init__(self, catalog: "MappedCatalog"):
+        self._catalog = catalog
+
+    def __len__(self) -> int:
+        return self._catalog.n_items
+
+    def __getitem__(self, item_id):
+        if isinstance(item_id, slice):
+            return [self[i] for i in range(*item_id.indices(len(self)))]
+        return self._catalog.item(item_id)
+
+
+class MappedCatalog(Catalog):
+    """Catalog backed by a memory-mapped compiled file; same query API as Catalog."""
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Compiled catalogs are little-endian; rebuild from the source catalog on this host")
+        self.path = path
+        self.version = next(_versions)
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled catalog")
+        self._sections = {}
+        for i in range(count):
+            name, start, length = _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+            self._sections[name.rstrip(b"\0").decode("ascii")] = (start, length)
+
+        view = memoryview(self._mm)
+        self._strofs = self._array("strofs", np.uint32)
+        start, length = self._sections["strblob"]
+        self._strblob = view[start:start + length]
+        self._records = self._array("records", np.uint32)
+        self._tags = self._array("tags", np.uint32)
+        self._postings = self._array("postings", np.uint32)
+        self.n_items = len(self._records) // _RECORD_WIDTH
+        self.items = _MappedItems(self)
+
+        # The key table is small (one row per distinct domain/level/platform/tag), so index it in a dict
+        keys = self._array("keys", np.uint32).reshape(-1, _KEY_WIDTH)
+        self._keys: Dict[Tuple[str, int, str], Tuple[int, int]] = {}
+        self._domain_names: Dict[str, str] = {}
+        for kind_sid, field, value_sid, start, count in keys.tolist():
+            self._keys[(self.string(kind_sid), field, self.string(value_sid))] = (start, count)
+            if field == _FIELD_CODES["domain"]:
+                first = self.item(int(self._postings[start]))
+                self._domain_names.setdefault(_norm(first["domain"]), first["domain"])
+
+        start, length = self._sections["paths"]
+        self.learning_paths = json.loads(bytes(view[start:start + length]).decode("utf-8"))
+        for domain in self.learning_paths:
+            self._domain_names.setdefault(_norm(domain), domain)
+        self._learning_paths = {_norm(k): v for k, v in self.learning_paths.items()}
+
+    def _array(self, name: str, dtype) -> "np.ndarray":
+        start, length = self._sections[name]
+        return np.frombuffer(self._mm, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=start)
+
+    def string(self, sid: int) -> Optional[str]:
+        if sid == NONE:
+            return None
+        return bytes(self._strblob[self._strofs[sid]:self._strofs[sid + 1]]).decode("utf-8")
+
+    def item(self, item_id: int) -> Dict[str, Any]:
+        if not 0 <= item_id < self.n_items:
+            raise IndexError(item_id)
+        base = item_id * _RECORD_WIDTH
+        kind, title, domain, level, platform, tags_start, tags_count = self._records[base:base + _RECORD_WIDTH].tolist()
+        item = {"title": self.string(title), "domain": self.string(domain)}
+        if level != NONE:
+            item["level"] = self.string(level)
+        if platform != NONE:
+            item["platform"] = self.string(platform)
+        item["tags"] = [self.string(t) for t in self._tags[tags_start:tags_start + tags_count].tolist()]
+        item["kind"] = self.string(kind)
+        return item
+
+    def _run(self, kind: str, field: str, value: str) -> Sequence[int]:
+        start, count = self._keys.get((kind, _FIELD_CODES[field], value), (0, 0))
+        return self._postings[start:start + count]
+
+    def ids_of_kind(self, kind: str) -> Sequence[int]:
+        return self._run(kind, "kind", kind)
+
+    def postings(self, kind: str, field: str, value: str) -> Sequence[int]:
+        return self._run(kind, field, _norm(value))
+
+    def domain_level_ids(self, kind: str, domain: str, level: str) -> Sequence[int]:
+        return self._run(kind, "domain_level", _norm(domain) + "\x1f" + _norm(level))
+
+    def prebuilt_ranker(self, kind: str) -> Optional[TfidfRanker]:
+        """The TF-IDF ranker compiled into the file for `kind`, backed by the mapping."""
+        if f"{kind}.ids" not in self._sections:
+            return None
+        arrays = {name: self._array(f"{kind}.{name}", dtype) for name, dtype in _RANKER_ARRAYS}
+        vocab = {self.string(sid): col for col, sid in enumerate(arrays.pop("vocab").tolist())}
+        return TfidfRanker.from_arrays(vocab=vocab, **arrays)
+
+
+# ============================================================================
+# Command line
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m actions.catalog_bin", description=__doc__.split("\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="compile a catalog (json, jsonl, sqlite or directory) to a .bin file")
+    p_build.add_argument("source")
+    p_build.add_argument("output")
+    p_info = sub.add_parser("info", help="print a summary of a compiled catalog")
+    p_info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        catalog = load_catalog(args.source)
+        build(catalog, args.output)
+        print(f"Wrote {len(catalog)} items to {args.output} ({os.path.getsize(args.output)} bytes)")
+    else:
+        catalog = MappedCatalog(args.path)
+        print(f"{args.path}: {len(catalog)} items, {len(catalog.domains())} domains")
+        for name, (start, length) in catalog._sections.items():
+            print(f"  {name:<16} {length:>12} bytes @ {start}")
+
+
+if __name__ == "__main__":
+    main()
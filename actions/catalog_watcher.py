@@ -0,0 +1,124 @@
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from .catalog import catalog_path, catalog_signature, load_catalog
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogWatcher(threading.Thread):
+    """Polls the catalog source and hot-swaps a rebuilt snapshot into the engine.
+
+    The new catalog and its indexes are built entirely on this thread; the
+    engine only sees the finished snapshot through one attribute assignment.
+    In-flight requests keep using the snapshot they already hold, and the old
+    one is released as soon as the last of them finishes. A catalog that fails
+    to load is logged once and skipped, leaving the current snapshot in place.
+    """
+
+    def __init__(self, engine, path: Optional[str] = None, interval: float = 5.0):
+        super().__init__(name="catalog-watcher", daemon=True)
+        self.engine = engine
+        self.path = path or catalog_path()
+        self.interval = interval
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload_seconds = 0.0
+        self._signature = catalog_signature(self.path)
+        # A source that failed to load is not retried until it changes again
+        self._failed_signature = None
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Catalog watcher check failed")
+
+    def check(self) -> bool:
+        """Reload if the source changed since the last successful load. Returns True on reload."""
+        signature = catalog_signature(self.path)
+        if signature == self._signature or signature == self._failed_signature:
+            return False
+        return self.reload(signature)
+
+    def reload(self, signature=None) -> bool:
+        from .recommendation_engine import CatalogSnapshot
+
+        start = time.perf_counter()
+        try:
+            snapshot = CatalogSnapshot(load_catalog(self.path))
+        except Exception:
+            self.failures += 1
+            self._failed_signature = signature
+            logger.exception("Catalog reload from %s failed; keeping the current catalog", self.path)
+            return False
+
+        old = self.engine.swap(snapshot)
+        self._signature = signature if signature is not None else catalog_signature(self.path)
+        self.reloads += 1
+        self.last_reload_seconds = time.perf_counter() - start
+        logger.info("Reloaded catalog from %s (%d items) in %.2fs",
+                    self.path, len(snapshot.catalog), self.last_reload_seconds)
+        # Drop our reference so the old snapshot is freed once in-flight requests release theirs
+        del old
+        return True
+
+    def stats(self):
+        return {"reloads": self.reloads, "failures": self.failures,
+                "last_reload_seconds": self.last_reload_seconds}
+
+
+_watcher: Optional[CatalogWatcher] = None
+# Set by `disable_watcher`; inherited by forked children
+_disabled = False
+
+
+def start_watcher(engine, interval: Optional[float] = None) -> Optional[CatalogWatcher]:
+    """Start the process-wide watcher for `engine` (CATALOG_WATCH_INTERVAL seconds, 0 disables)."""
+    global _watcher
+    if interval is None:
+        interval = float(os.getenv("CATALOG_WATCH_INTERVAL", "5"))
+    if interval <= 0 or _disabled or _watcher is not None:
+        return _watcher
+    _watcher = CatalogWatcher(engine, interval=interval)
+    _watcher.start()
+    return _watcher
+
+
+def watcher_stats():
+    """Reload counters of the running watcher (empty when watching is disabled)."""
+    return _watcher.stats() if _watcher is not None else {}
+
+
+def disable_watcher():
+    """Stop the watcher for good in this process and in the children it forks.
+
+    For `actions.prefork`, whose workers reload the catalog through the
+    launcher's SIGHUP rolling restart instead.
+    """
+    global _watcher, _disabled
+    _disabled = True
+    watcher, _watcher = _watcher, None
+    if watcher is not None:
+        watcher.stop()
+        watcher.join()
+
+
+def _restart_after_fork():
+    # Threads do not survive fork: give a forked child (e.g. an ACTION_POOL=process worker)
+    # its own watcher on the inherited engine, so it does not keep ranking on a stale catalog
+    global _watcher
+    watcher, _watcher = _watcher, None
+    if watcher is not None:
+        start_watcher(watcher.engine, watcher.interval)
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
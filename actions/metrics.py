@@ -0,0 +1,229 @@
+"""Per-action latency metrics and a Prometheus text endpoint.
+
+Decorate an action class with `@instrument` to record its call count, error
+count and a latency histogram. Recording costs two `perf_counter` calls and a
+bisect into the bucket list, under a microsecond per call. Other components expose
+their counters through `register_stats`. Everything is rendered in the
+Prometheus text format, either by `render()` or by the HTTP server that
+`start_metrics_server` runs on METRICS_PORT, which also answers `/ready`.
+"""
+import bisect
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .startup import is_ready
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; tuned for actions that take from tens of µs to a few seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram. `observe` is not locked: actions run on the event loop thread."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One extra slot for observations above the largest bucket (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total, result = 0, []
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            total += n
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+class ActionStats:
+    __slots__ = ("calls", "errors", "timeouts", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.latency = Histogram()
+
+
+_actions: Dict[str, ActionStats] = {}
+_stats_sources: List[Tuple[str, Dict[str, str], Callable[[], Dict[str, Any]]]] = []
+
+
+def action_stats(name: str) -> ActionStats:
+    stats = _actions.get(name)
+    if stats is None:
+        stats = _actions.setdefault(name, ActionStats())
+    return stats
+
+
+def record_timeout(name: str):
+    """Count an action that answered with its degraded response."""
+    action_stats(name).timeouts += 1
+
+
+def _stats_for(action) -> ActionStats:
+    # Cached on the instance: rasa_sdk keeps one instance per action, so this runs once
+    stats = action.__dict__.get("_action_stats")
+    if stats is None:
+        stats = action._action_stats = action_stats(action.name())
+    return stats
+
+
+def instrument(cls):
+    """Class decorator: time every call to `cls.run(dispatcher, tracker, domain)` and count calls and errors."""
+    run = cls.run
+    clock = time.perf_counter
+    bisect_left = bisect.bisect_left
+    buckets = LATENCY_BUCKETS
+
+    # The histogram update is inlined; a method call per observation would double the overhead
+    if inspect.iscoroutinefunction(run):
+        @functools.wraps(run)
+        async def timed_run(self, dispatcher, tracker, domain):
+            start = clock()
+            try:
+                return await run(self, dispatcher, tracker, domain)
+            except BaseException:
+                _stats_for(self).errors += 1
+                raise
+            finally:
+                elapsed = clock() - start
+                stats = _stats_for(self)
+                stats.calls += 1
+                latency = stats.latency
+                latency.counts[bisect_left(buckets, elapsed)] += 1
+                latency.sum += elapsed
+                latency.count += 1
+    else:
+        @functools.wraps(run)
+        def timed_run(self, dispatcher, tracker, domain):
+            start = clock()
+            try:
+                return run(self, dispatcher, tracker, domain)
+            except BaseException:
+                _stats_for(self).errors += 1
+                raise
+            finally:
+                elapsed = clock() - start
+                stats = _stats_for(self)
+                stats.calls += 1
+                latency = stats.latency
+                latency.counts[bisect_left(buckets, elapsed)] += 1
+                latency.sum += elapsed
+                latency.count += 1
+
+    cls.run = timed_run
+    return cls
+
+
+def register_stats(prefix: str, stats: Callable[[], Dict[str, Any]], **labels: str):
+    """Export every numeric value of `stats()` as a `<prefix>_<key>` gauge, read at scrape time."""
+    _stats_sources.append((prefix, labels, stats))
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP action_latency_seconds Custom action run latency.",
+        "# TYPE action_latency_seconds histogram",
+    ]
+    actions = sorted(_actions.items())
+    for name, stats in actions:
+        for le, count in stats.latency.cumulative():
+            lines.append(f'action_latency_seconds_bucket{{action="{name}",le="{le}"}} {count}')
+        lines.append(f'action_latency_seconds_sum{{action="{name}"}} {stats.latency.sum}')
+        lines.append(f'action_latency_seconds_count{{action="{name}"}} {stats.latency.count}')
+    for metric, attr, help_text in (("action_calls_total", "calls", "Custom action runs."),
+                                    ("action_errors_total", "errors", "Custom action runs that raised."),
+                                    ("action_timeouts_total", "timeouts", "Runs answered with a degraded response.")):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, stats in actions:
+            lines.append(f'{metric}{{action="{name}"}} {getattr(stats, attr)}')
+
+    seen = set()
+    for prefix, labels, stats in _stats_sources:
+        try:
+            values = stats()
+        except Exception:
+            logger.exception("Metrics source %s failed", prefix)
+            continue
+        for key, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            metric = f"{prefix}_{key}"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/ready":
+            ready = is_ready()
+            body = b'{"status": "ready"}' if ready else b'{"status": "starting"}'
+            self.send_response(200 if ready else 503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if path != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(port: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics on a sidecar port (METRICS_PORT; unset or 0 disables). Safe to call more than once."""
+    global _server
+    if port is None:
+        port = int(os.getenv("METRICS_PORT", "0"))
+    if port <= 0 or _server is not None:
+        return _server
+    try:
+        _server = ThreadingHTTPServer((os.getenv("METRICS_HOST", "0.0.0.0"), port), _MetricsHandler)
+    except OSError:
+        logger.exception("Could not start the metrics server on port %d", port)
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info("Serving metrics on :%d/metrics", port)
+    return _server
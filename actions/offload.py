@@ -0,0 +1,71 @@
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from .recommendation_engine import get_engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# "thread" or "process". Ranking is NumPy-heavy and releases the GIL for most
+# of its work, so threads are the default; a process pool avoids the GIL entirely.
+POOL_KIND = os.getenv("ACTION_POOL", "thread")
+POOL_SIZE = int(os.getenv("ACTION_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+# Maximum number of actions doing work at once; the rest queue (and count against their timeout)
+CONCURRENCY = int(os.getenv("ACTION_CONCURRENCY", "64"))
+# Seconds before an action gives up and returns a degraded answer. Only the wait is abandoned:
+# pool jobs not started yet are cancelled with it, but a job already running in the pool runs
+# to completion and keeps its worker busy until then. ACTION_POOL_SIZE bounds how many can.
+TIMEOUT = float(os.getenv("ACTION_TIMEOUT", "5"))
+
+_executor: Optional[Executor] = None
+_limiter: Optional[asyncio.Semaphore] = None
+
+
+def get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if POOL_KIND == "process":
+            _executor = ProcessPoolExecutor(max_workers=POOL_SIZE)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="action-cpu")
+    return _executor
+
+
+def call_engine(method: str, *args: Any, **kwargs: Any) -> Any:
+    """Call a RecommendationEngine method on this process's engine (picklable for process pools)."""
+    return getattr(get_engine(), method)(*args, **kwargs)
+
+
+async def offload(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run CPU-bound work in the configured pool instead of on the event loop.
+
+    With ACTION_POOL=process, `fn` and its arguments must be picklable; use
+    `call_engine` rather than bound engine methods.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def run_limited(work: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+    """Run `work()` under the shared concurrency limit, raising asyncio.TimeoutError after `timeout` seconds."""
+    global _limiter
+    if _limiter is None:
+        _limiter = asyncio.Semaphore(CONCURRENCY)
+
+    async def limited() -> T:
+        async with _limiter:
+            return await work()
+
+    return await asyncio.wait_for(limited(), timeout if timeout is not None else TIMEOUT)
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
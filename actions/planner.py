@@ -0,0 +1,224 @@
+import heapq
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .taxonomy import get_taxonomy
+
+FALLBACK_PATH = "I recommend starting with the basics of Computer Science and then specializing."
+
+# Estimated weeks per stage, matched by keyword against the stage name.
+# Order matters: when several keywords match, the earliest one wins.
+DEFAULT_STAGE_WEEKS = (
+    ('python', 2),
+    ('math for ml', 4),
+    ('basic ml algorithms', 6),
+    ('deep learning', 10),
+    ('nlp/cv', 8),
+    ('html/css', 2),
+    ('javascript', 4),
+    ('react/vue', 6),
+    ('node.js', 6),
+    ('databases', 4),
+    ('devops', 6),
+    ('networking basics', 3),
+    ('linux', 3),
+    ('scripting (python/bash)', 4),
+    ('ethical hacking', 6),
+    ('cloud security', 6),
+)
+DEFAULT_WEEKS = 6
+
+# (upper bound on hours per day, speed factor); more hours -> faster progress
+SPEED_FACTORS = ((0.75, 1.8), (1.5, 1.2), (3.0, 1.0), (float("inf"), 0.8))
+
+_HOURS_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+def parse_hours_per_day(time_commitment: Any) -> float:
+    m = _HOURS_RE.search(str(time_commitment))
+    return float(m.group(1)) if m else 1.0
+
+
+def speed_bucket(hours_per_day: float) -> int:
+    for bucket, (limit, _) in enumerate(SPEED_FACTORS):
+        if hours_per_day < limit:
+            return bucket
+    return len(SPEED_FACTORS) - 1
+
+
+def knows_python(skills: Iterable[str]) -> bool:
+    # Through the taxonomy, so "py", "Python 3" and "pyhton" count too
+    return 'python' in get_taxonomy().ids('skill', skills)
+
+
+def _normalize_stage(name: str) -> str:
+    return name.lower().replace('.', '').replace('  ', ' ').strip()
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton mapping keywords to values.
+
+    `first` returns the value of the earliest-registered keyword occurring in
+    the text, in a single pass over the text regardless of the number of
+    keywords.
+    """
+
+    def __init__(self, keywords: Sequence[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [-1]  # best (lowest) keyword priority ending at this node
+        self._values = [value for _, value in keywords]
+
+        for priority, (keyword, _) in enumerate(keywords):
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(-1)
+                node = nxt
+            if self._out[node] == -1 or priority < self._out[node]:
+                self._out[node] = priority
+
+        # Breadth-first pass to compute failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0) if node else 0
+                inherited = self._out[self._fail[nxt]]
+                if inherited != -1 and (self._out[nxt] == -1 or inherited < self._out[nxt]):
+                    self._out[nxt] = inherited
+
+    def first(self, text: str, default: Any = None) -> Any:
+        best = -1
+        node = 0
+        for ch in text:
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            out = self._out[node]
+            if out != -1 and (best == -1 or out < best):
+                best = out
+        return self._values[best] if best != -1 else default
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    weeks: int
+    requires: Tuple[int, ...]
+    is_python: bool
+
+
+@dataclass(frozen=True)
+class LearningPlan:
+    stages: Tuple[Tuple[str, int], ...]  # (stage name, adjusted weeks) in study order
+    total_weeks: int
+    display_path: str
+
+
+class StageGraph:
+    """A domain's prerequisite DAG, compiled into a study order with every plan variant precomputed."""
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages = tuple(stages)
+        self.order = self._topological_order()
+        self.display_path = ' -> '.join(self.stages[i].name for i in self.order)
+        self._plans = {
+            (bucket, skip_python): self._build_plan(factor, skip_python)
+            for bucket, (_, factor) in enumerate(SPEED_FACTORS)
+            for skip_python in (False, True)
+        }
+
+    def _topological_order(self) -> Tuple[int, ...]:
+        # Kahn's algorithm, preferring declaration order among ready stages
+        remaining = [len(s.requires) for s in self.stages]
+        dependents: List[List[int]] = [[] for _ in self.stages]
+        for i, stage in enumerate(self.stages):
+            for req in stage.requires:
+                dependents[req].append(i)
+        ready = [i for i, n in enumerate(remaining) if n == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            i = heapq.heappop(ready)
+            order.append(i)
+            for dep in dependents[i]:
+                remaining[dep] -= 1
+                if remaining[dep] == 0:
+                    heapq.heappush(ready, dep)
+        if len(order) != len(self.stages):
+            raise ValueError("Learning path prerequisites contain a cycle")
+        return tuple(order)
+
+    def _build_plan(self, speed_factor: float, skip_python: bool) -> LearningPlan:
+        # If the user already knows Python, Python stages are dropped entirely
+        kept = [self.stages[i] for i in self.order if not (skip_python and self.stages[i].is_python)]
+        timeline = tuple((s.name, max(1, int(s.weeks * speed_factor))) for s in kept)
+        return LearningPlan(
+            stages=timeline,
+            total_weeks=sum(w for _, w in timeline),
+            display_path=' -> '.join(s.name for s in kept),
+        )
+
+    def plan(self, hours_per_day: float, skip_python: bool) -> LearningPlan:
+        return self._plans[(speed_bucket(hours_per_day), skip_python)]
+
+
+class LearningPathPlanner:
+    """Compiles per-domain learning paths once and answers plan requests by lookup.
+
+    A path spec is either a linear string ("A -> B -> C") or a dict with a
+    `stages` list of {"name", "requires": [names], "weeks" (optional)}.
+    """
+
+    def __init__(self, learning_paths: Dict[str, Any], stage_weeks: Sequence[Tuple[str, int]] = DEFAULT_STAGE_WEEKS):
+        self.matcher = KeywordMatcher(stage_weeks)
+        self._graphs = {domain.strip().casefold(): self.compile(spec) for domain, spec in learning_paths.items()}
+        self._fallback = self.compile(FALLBACK_PATH)
+
+    def stage_weeks(self, stage_name: str) -> int:
+        return self.matcher.first(_normalize_stage(stage_name), DEFAULT_WEEKS)
+
+    def compile(self, spec: Any) -> StageGraph:
+        if isinstance(spec, str):
+            names = [s.strip() for s in spec.split('->')]
+            entries = [{"name": n, "requires": names[i - 1:i]} for i, n in enumerate(names)]
+        else:
+            entries = spec["stages"]
+
+        positions = {e["name"]: i for i, e in enumerate(entries)}
+        stages = []
+        for entry in entries:
+            name = entry["name"]
+            try:
+                requires = tuple(positions[r] for r in entry.get("requires", ()))
+            except KeyError as e:
+                raise ValueError(f"Stage '{name}' requires unknown stage {e}") from None
+            weeks = entry.get("weeks") or self.stage_weeks(name)
+            stages.append(Stage(name, int(weeks), requires, 'python' in name.lower()))
+        return StageGraph(stages)
+
+    def graph(self, domain: Optional[str]) -> Optional[StageGraph]:
+        if not domain:
+            return None
+        return self._graphs.get(domain.strip().casefold())
+
+    def display_path(self, domain: Optional[str]) -> Optional[str]:
+        graph = self.graph(domain)
+        return graph.display_path if graph else None
+
+    def plan(self, domain: Optional[str], time_commitment: Any = "1 hour", skills: Iterable[str] = ()) -> LearningPlan:
+        """Plan a path for the domain, falling back to the generic advice for unknown domains."""
+        graph = self.graph(domain) or self._fallback
+        return graph.plan(parse_hours_per_day(time_commitment), knows_python(skills))
@@ -0,0 +1,264 @@
+"""Pre-forking launcher for the action server.
+
+`python -m rasa_sdk --actions actions` serves every action from one process,
+so one core. This launcher imports the actions and builds the
+RecommendationEngine once, then forks ACTION_WORKERS processes (default: CPU
+count) that serve the same listening socket:
+
+    python -m actions.prefork --port 5055 --workers 4
+
+The catalog, its indexes and rankers are built before forking and frozen out
+of the garbage collector, so workers share them copy-on-write. The kernel
+hands each new connection to whichever worker accepts it first.
+
+Signals to the launcher:
+
+- SIGHUP: reload the catalog, then replace workers one at a time. Each new
+  worker is serving before the old one is asked to finish its in-flight
+  requests and exit, so the port never stops accepting. This is the only way
+  the catalog is reloaded here; CATALOG_WATCH_INTERVAL does not apply.
+- SIGTERM / SIGINT: stop all workers gracefully and exit.
+
+A worker that dies is replaced. With METRICS_PORT set, worker i serves its
+own /metrics on METRICS_PORT + i.
+"""
+import argparse
+import gc
+import inspect
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from .startup import is_ready, wait_ready
+
+logger = logging.getLogger(__name__)
+
+# Seconds a new worker gets to start serving, and an old one to drain, during a rolling restart
+READY_TIMEOUT = float(os.getenv("ACTION_WORKER_READY_TIMEOUT", "60"))
+STOP_TIMEOUT = float(os.getenv("ACTION_WORKER_STOP_TIMEOUT", "30"))
+
+
+def bind_socket(host: str, port: int, backlog: int = 1024) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve_metrics(port: int):
+    from .metrics import start_metrics_server
+
+    # During a rolling restart the worker being replaced still holds the port for a moment
+    deadline = time.monotonic() + STOP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                pass
+        except OSError:
+            break
+        time.sleep(0.5)
+    start_metrics_server(port)
+
+
+def serve_worker(executor, sock: socket.socket, index: int, ready_fd: int, cors, metrics_port: int):
+    """Worker body: run the rasa_sdk Sanic app in this process on the inherited socket."""
+    from rasa_sdk.endpoint import create_app
+    from sanic import response
+
+    if metrics_port > 0:
+        threading.Thread(target=_serve_metrics, args=(metrics_port + index,), daemon=True).start()
+
+    app = create_app(executor, cors_origins=cors)
+
+    @app.get("/ready")
+    async def ready(_):
+        if is_ready():
+            return response.json({"status": "ready"})
+        return response.json({"status": "starting"}, status=503)
+
+    async def signal_ready(app, *args):
+        os.write(ready_fd, b"1")
+        os.close(ready_fd)
+
+    app.register_listener(signal_ready, "after_server_start")
+    options = {"sock": sock, "workers": 1, "access_log": False, "motd": False, "single_process": True}
+    # Only pass what this Sanic version understands (single_process arrived in 22.9)
+    accepted = inspect.signature(app.run).parameters
+    app.run(**{k: v for k, v in options.items() if k in accepted})
+
+
+class Supervisor:
+    """Forks the workers, replaces dead ones and performs rolling restarts."""
+
+    def __init__(self, executor, sock: socket.socket, workers: int, cors, metrics_port: int):
+        self.executor = executor
+        self.sock = sock
+        self.size = workers
+        self.cors = cors
+        self.metrics_port = metrics_port
+        self.workers: Dict[int, int] = {}  # pid -> worker index
+        self._restart = False
+        self._stop = False
+
+    def spawn(self, index: int) -> Optional[int]:
+        """Fork worker `index`; returns its pid once it is serving, or None if it failed to start."""
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, signal.SIG_DFL)
+            code = 0
+            try:
+                serve_worker(self.executor, self.sock, index, write_fd, self.cors, self.metrics_port)
+            except Exception:
+                logger.exception("Action worker %d crashed", index)
+                code = 1
+            finally:
+                # Flush logs and run atexit handlers (pending profile saves) in this process only
+                logging.shutdown()
+            sys.exit(code)
+
+        os.close(write_fd)
+        self.workers[pid] = index
+        ready, _, _ = select.select([read_fd], [], [], READY_TIMEOUT)
+        started = bool(ready) and os.read(read_fd, 1) == b"1"
+        os.close(read_fd)
+        if not started:
+            logger.error("Action worker %d (pid %d) did not start serving", index, pid)
+            return None
+        logger.info("Action worker %d serving (pid %d)", index, pid)
+        return pid
+
+    def stop_worker(self, pid: int, timeout: float = STOP_TIMEOUT):
+        """Ask a worker to finish in-flight requests and exit; kill it after `timeout` seconds."""
+        self.workers.pop(pid, None)
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                return
+            time.sleep(0.05)
+        logger.warning("Action worker pid %d did not stop in %.0fs; killing it", pid, timeout)
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+    def rolling_restart(self):
+        from .catalog import load_catalog
+        from .recommendation_engine import CatalogSnapshot, get_engine
+
+        try:
+            get_engine().swap(CatalogSnapshot(load_catalog()))
+            gc.freeze()
+        except Exception:
+            logger.exception("Catalog reload failed; restarting workers on the current catalog")
+        for pid, index in sorted(self.workers.items(), key=lambda item: item[1]):
+            if self._stop:
+                return
+            if self.spawn(index) is None:
+                # Keep the old worker rather than lose capacity
+                continue
+            self.stop_worker(pid)
+        logger.info("Rolling restart finished")
+
+    def run(self):
+        signal.signal(signal.SIGHUP, self._on_hup)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        for index in range(self.size):
+            self.spawn(index)
+
+        while not self._stop:
+            if self._restart:
+                self._restart = False
+                self.rolling_restart()
+            self._reap()
+            time.sleep(0.2)
+
+        for pid in list(self.workers):
+            os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + STOP_TIMEOUT
+        while self.workers and time.monotonic() < deadline:
+            self._reap(respawn=False)
+            time.sleep(0.05)
+        for pid in list(self.workers):
+            self.stop_worker(pid, timeout=0)
+
+    def _reap(self, respawn: bool = True):
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            index = self.workers.pop(pid, None)
+            if index is None:
+                continue
+            if respawn and not self._stop:
+                logger.warning("Action worker %d (pid %d) exited with status %d; replacing it",
+                               index, pid, os.waitstatus_to_exitcode(status))
+                self.spawn(index)
+
+    def _on_hup(self, signum, frame):
+        self._restart = True
+
+    def _on_stop(self, signum, frame):
+        self._stop = True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m actions.prefork", description=__doc__.split("\n")[0])
+    parser.add_argument("--actions", default="actions", help="actions package to serve (default: actions)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("ACTION_PORT", "5055")))
+    parser.add_argument("--host", default=os.getenv("SANIC_HOST", "0.0.0.0"))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("ACTION_WORKERS") or os.cpu_count() or 1))
+    parser.add_argument("--cors", nargs="*", default="*")
+    parser.add_argument("--loglevel", default=os.getenv("LOG_LEVEL", "INFO"))
+    args = parser.parse_args(argv)
+
+    from rasa_sdk import utils
+    from rasa_sdk.executor import ActionExecutor
+
+    from .catalog_watcher import disable_watcher
+
+    utils.configure_colored_logging(args.loglevel)
+    utils.update_sanic_log_level()
+
+    # Each worker serves its own metrics; keep the launcher from binding METRICS_PORT at import
+    metrics_port = int(os.environ.pop("METRICS_PORT", "0") or 0)
+
+    started = time.perf_counter()
+    executor = ActionExecutor()
+    # Imports the actions, which start building the engine, catalog indexes and rankers in this process
+    executor.register_package(args.actions)
+    # Catalog reloads go through SIGHUP; neither the launcher nor its workers watch the catalog
+    disable_watcher()
+    # Fork only once the warm-up thread has built the indexes, so workers inherit them instead of each building its own
+    if not wait_ready(READY_TIMEOUT):
+        logger.warning("Catalog warm-up did not finish in %.0fs; workers will build their own indexes", READY_TIMEOUT)
+    # Objects that exist now are shared with every worker; keep the collector from touching their pages
+    gc.collect()
+    gc.freeze()
+    logger.info("Loaded %d actions in %.2fs; starting %d workers on %s:%d",
+                len(executor.actions), time.perf_counter() - started, args.workers, args.host, args.port)
+
+    sock = bind_socket(args.host, args.port)
+    Supervisor(executor, sock, args.workers, args.cors, metrics_port).run()
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
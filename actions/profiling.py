@@ -0,0 +1,270 @@
+"""Opt-in profiling of slow or sampled action runs.
+
+Decorate an action class with `@profiled` to capture where its time goes:
+
+- TRACE_SLOW_MS: every run is stack-sampled by a background thread, and runs
+  slower than this many milliseconds are written out as folded stacks
+  (`.folded`, one "frame;frame;frame count" line per stack, ready for
+  flamegraph tools). Suspended coroutines are sampled through their await
+  chain, so time spent waiting on the database shows up as well.
+- TRACE_SAMPLE_RATE: this fraction of runs (0-1) is run under cProfile and
+  written as `.prof` files for `pstats`/snakeviz. Only one run is profiled at
+  a time, and the profile also includes whatever else ran on the event loop
+  while that run was awaiting.
+
+Traces go to TRACE_DIR (default `traces/`). Each file name includes the
+action name, sender_id and duration. Only the newest TRACE_KEEP files
+(default 200) are kept.
+
+With neither setting, `@profiled` returns the class unchanged, so disabled
+profiling costs nothing.
+"""
+import asyncio
+import cProfile
+import functools
+import inspect
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "0"))
+SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+KEEP = int(os.getenv("TRACE_KEEP", "200"))
+# Stack sampling period while slow-run tracing is on
+INTERVAL = float(os.getenv("TRACE_INTERVAL_MS", "5")) / 1000.0
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def enabled() -> bool:
+    return SLOW_MS > 0 or SAMPLE_RATE > 0
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class _Run:
+    """One in-flight action run being stack-sampled."""
+
+    __slots__ = ("action", "sender", "root", "thread_id", "task", "stacks", "samples")
+
+    def __init__(self, action: str, sender: str, root, task):
+        self.action = action
+        self.sender = sender
+        self.root = root
+        self.thread_id = threading.get_ident()
+        self.task = task
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def stack(self) -> Optional[str]:
+        # Running right now: the thread's frames from the innermost one back up to the action
+        names = []
+        frame = sys._current_frames().get(self.thread_id)
+        while frame is not None:
+            names.append(_frame_label(frame))
+            if frame is self.root:
+                return ";".join(reversed(names))
+            frame = frame.f_back
+        if self.task is None:
+            return None
+
+        # Suspended: follow the await chain from the task's coroutine down through the action
+        names, found = [], False
+        coro = self.task.get_coro()
+        while coro is not None:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+            if frame is None:
+                break
+            found = found or frame is self.root
+            if found:
+                names.append(_frame_label(frame))
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+            if coro is not None and not hasattr(coro, "cr_frame") and not hasattr(coro, "gi_frame"):
+                names.append(f"<await {type(coro).__name__}>")
+                break
+        return ";".join(names) if found else None
+
+
+class _Tracer(threading.Thread):
+    """Samples in-flight runs every INTERVAL seconds and writes finished traces off the event loop."""
+
+    def __init__(self):
+        super().__init__(name="action-tracer", daemon=True)
+        self.runs = set()
+        self.writes: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._sequence = 0
+
+    def begin(self, run: _Run):
+        with self._lock:
+            self.runs.add(run)
+        self._wake.set()
+
+    def end(self, run: _Run):
+        with self._lock:
+            self.runs.discard(run)
+
+    def run(self):
+        while True:
+            with self._lock:
+                runs = list(self.runs)
+            if runs:
+                for run in runs:
+                    try:
+                        stack = run.stack()
+                    except Exception:
+                        stack = None
+                    if stack:
+                        run.stacks[stack] += 1
+                        run.samples += 1
+                time.sleep(INTERVAL)
+            else:
+                self._wake.wait(1.0)
+                self._wake.clear()
+            self._drain()
+
+    def submit(self, write):
+        self.writes.put(write)
+        self._wake.set()
+
+    def _drain(self):
+        while True:
+            try:
+                write = self.writes.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                write()
+            except Exception:
+                logger.exception("Could not write action trace")
+
+    def path(self, action: str, sender: str, elapsed: float, suffix: str) -> str:
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        self._sequence += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        name = f"{stamp}-{os.getpid()}-{self._sequence:06d}_{action}_{sender}_{elapsed * 1000:.0f}ms{suffix}"
+        return os.path.join(TRACE_DIR, _UNSAFE_CHARS.sub("_", name))
+
+    def rotate(self):
+        if KEEP <= 0:
+            return
+        names = sorted(n for n in os.listdir(TRACE_DIR) if n.endswith((".folded", ".prof")))
+        for name in names[:-KEEP]:
+            try:
+                os.remove(os.path.join(TRACE_DIR, name))
+            except OSError:
+                pass
+
+
+_tracer: Optional[_Tracer] = None
+_tracer_lock = threading.Lock()
+_cprofile_busy = False
+
+
+def _get_tracer() -> _Tracer:
+    # Started on first use, so each forked worker gets its own thread
+    global _tracer
+    if _tracer is None or not _tracer.is_alive():
+        with _tracer_lock:
+            if _tracer is None or not _tracer.is_alive():
+                _tracer = _Tracer()
+                _tracer.start()
+    return _tracer
+
+
+def _write_folded(tracer: _Tracer, run: _Run, elapsed: float):
+    path = tracer.path(run.action, run.sender, elapsed, ".folded")
+    with open(path, "w") as f:
+        f.write(f"# action={run.action} sender_id={run.sender} duration_ms={elapsed * 1000:.1f} "
+                f"samples={run.samples} interval_ms={INTERVAL * 1000:g}\n")
+        for stack, count in run.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    tracer.rotate()
+
+
+def _write_profile(tracer: _Tracer, profiler: cProfile.Profile, action: str, sender: str, elapsed: float):
+    profiler.dump_stats(tracer.path(action, sender, elapsed, ".prof"))
+    tracer.rotate()
+
+
+class _Trace:
+    """Per-run state shared by the sync and async wrappers."""
+
+    __slots__ = ("action", "sender", "start", "run", "profiler")
+
+    def __init__(self, action_name: str, tracker, root, task):
+        global _cprofile_busy
+        self.action = action_name
+        self.sender = str(getattr(tracker, "sender_id", "unknown"))
+        self.run = None
+        self.profiler = None
+        if SAMPLE_RATE > 0 and not _cprofile_busy and random.random() < SAMPLE_RATE:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active on this thread
+                profiler = None
+            if profiler is not None:
+                _cprofile_busy = True
+                self.profiler = profiler
+        if SLOW_MS > 0:
+            self.run = _Run(self.action, self.sender, root, task)
+            _get_tracer().begin(self.run)
+        self.start = time.perf_counter()
+
+    def finish(self):
+        global _cprofile_busy
+        elapsed = time.perf_counter() - self.start
+        tracer = None
+        if self.profiler is not None:
+            self.profiler.disable()
+            _cprofile_busy = False
+            tracer = _get_tracer()
+            tracer.submit(functools.partial(_write_profile, tracer, self.profiler, self.action, self.sender, elapsed))
+        if self.run is not None:
+            tracer = tracer or _get_tracer()
+            tracer.end(self.run)
+            if elapsed * 1000 >= SLOW_MS:
+                tracer.submit(functools.partial(_write_folded, tracer, self.run, elapsed))
+
+
+def profiled(cls):
+    """Class decorator: trace slow or sampled calls of `cls.run(dispatcher, tracker, domain)`."""
+    if not enabled():
+        return cls
+    run = cls.run
+
+    if inspect.iscoroutinefunction(run):
+        @functools.wraps(run)
+        async def traced_run(self, dispatcher, tracker, domain):
+            trace = _Trace(self.name(), tracker, sys._getframe(), asyncio.current_task())
+            try:
+                return await run(self, dispatcher, tracker, domain)
+            finally:
+                trace.finish()
+    else:
+        @functools.wraps(run)
+        def traced_run(self, dispatcher, tracker, domain):
+            trace = _Trace(self.name(), tracker, sys._getframe(), None)
+            try:
+                return run(self, dispatcher, tracker, domain)
+            finally:
+                trace.finish()
+
+    cls.run = traced_run
+    return cls
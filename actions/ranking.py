@@ -0,0 +1,155 @@
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .startup import lazy_import
+
+# Imported on first use, so importing the actions does not pay for NumPy
+np = lazy_import("numpy")
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t.rstrip(".") for t in _TOKEN_RE.findall(str(text).lower())]
+
+
+def item_terms(item: Dict[str, Any]) -> List[str]:
+    """Terms describing a catalog item: title and domain words plus tags (as words and as phrases)."""
+    terms = tokenize(item.get("title", "")) + tokenize(item.get("domain", ""))
+    for tag in item.get("tags") or ():
+        words = tokenize(tag)
+        terms.extend(words)
+        if len(words) > 1:
+            terms.append(" ".join(words))
+    return terms
+
+
+def profile_terms(profile: Optional[Dict[str, Any]], domain: Optional[str] = None) -> List[str]:
+    """Terms for a user profile built from the skills, interests and learning_goal slots."""
+    texts: List[str] = []
+    if domain:
+        texts.append(domain)
+    for key in ("interests", "skills", "learning_goal"):
+        value = (profile or {}).get(key)
+        if not value:
+            continue
+        texts.extend(value if isinstance(value, (list, tuple)) else [value])
+    terms: List[str] = []
+    for text in texts:
+        words = tokenize(text)
+        terms.extend(words)
+        if len(words) > 1:
+            terms.append(" ".join(words))
+    return terms
+
+
+class TfidfRanker:
+    """Sparse TF-IDF index over a set of catalog items.
+
+    The item-term matrix is stored column-wise (one slice of item ids and
+    weights per term), so scoring a query is a sparse matrix-vector product
+    over the query's terms only, followed by an `argpartition` for the top k.
+    """
+
+    def __init__(self, ids: Sequence[int], documents: Iterable[List[str]]):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        n_items = len(self.ids)
+
+        vocab: Dict[str, int] = {}
+        rows: List[Dict[int, int]] = []
+        for terms in documents:
+            counts: Dict[int, int] = {}
+            for term in terms:
+                col = vocab.setdefault(term, len(vocab))
+                counts[col] = counts.get(col, 0) + 1
+            rows.append(counts)
+
+        df = np.zeros(len(vocab), dtype=np.float64)
+        for counts in rows:
+            for col in counts:
+                df[col] += 1
+        self.idf = (np.log((1 + n_items) / (1 + df)) + 1.0).astype(np.float32)
+        self.vocab = vocab
+
+        # Build a CSC matrix of L2-normalized tf-idf weights
+        cols: List[List[Tuple[int, float]]] = [[] for _ in vocab]
+        for row, counts in enumerate(rows):
+            weights = {col: (1.0 + math.log(tf)) * float(self.idf[col]) for col, tf in counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for col, w in weights.items():
+                cols[col].append((row, w / norm))
+
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        for col, entries in enumerate(cols):
+            indptr[col + 1] = indptr[col] + len(entries)
+        self.indptr = indptr
+        self.indices = np.fromiter((r for entries in cols for r, _ in entries), dtype=np.int32, count=int(indptr[-1]))
+        self.data = np.fromiter((w for entries in cols for _, w in entries), dtype=np.float32, count=int(indptr[-1]))
+
+    @classmethod
+    def from_arrays(cls, ids: "np.ndarray", vocab: Dict[str, int], idf: "np.ndarray",
+                    indptr: "np.ndarray", indices: "np.ndarray", data: "np.ndarray") -> "TfidfRanker":
+        """Rebuild a ranker from precomputed arrays (e.g. memory-mapped from a compiled catalog)."""
+        ranker = cls.__new__(cls)
+        ranker.ids, ranker.vocab, ranker.idf = ids, vocab, idf
+        ranker.indptr, ranker.indices, ranker.data = indptr, indices, data
+        return ranker
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def query_vector(self, terms: Iterable[str]) -> Dict[int, float]:
+        counts: Dict[int, int] = {}
+        for term in terms:
+            col = self.vocab.get(term)
+            if col is not None:
+                counts[col] = counts.get(col, 0) + 1
+        weights = {col: (1.0 + math.log(tf)) * float(self.idf[col]) for col, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {col: w / norm for col, w in weights.items()}
+
+    def scores(self, terms: Iterable[str]) -> "np.ndarray":
+        """Cosine similarity of every item against the query terms."""
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for col, weight in self.query_vector(terms).items():
+            start, end = self.indptr[col], self.indptr[col + 1]
+            # Item ids are unique within a column, so fancy-index += is safe here
+            scores[self.indices[start:end]] += weight * self.data[start:end]
+        return scores
+
+    def top_k(self, terms: Iterable[str], k: int = 5) -> List[Tuple[int, float]]:
+        """Return up to k (catalog item id, score) pairs with a positive score, best first."""
+        scores = self.scores(terms)
+        n = len(scores)
+        if n == 0 or k <= 0:
+            return []
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(self.ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def rerank(self, item_ids: Sequence[int], terms: Iterable[str], k: Optional[int] = None) -> List[int]:
+        """Order a subset of catalog item ids by similarity to the query, keeping ties in input order.
+
+        With `k`, only the best k are selected (by `argpartition`) and sorted.
+        """
+        if len(item_ids) == 0:
+            return []
+        scores = self.scores(terms)
+        subset = scores[np.searchsorted(self.ids, np.asarray(item_ids, dtype=np.int64))]
+        if k is not None and k < len(subset):
+            if k <= 0:
+                return []
+            top = np.argpartition(-subset, k - 1)[:k]
+            # argpartition picks arbitrarily among items tied at the k-th score; take the earliest ones
+            kth = subset[top].min()
+            above = np.flatnonzero(subset > kth)
+            tied = np.flatnonzero(subset == kth)[:k - len(above)]
+            candidates = np.sort(np.concatenate((above, tied)))
+        else:
+            candidates = np.arange(len(subset))
+        order = candidates[np.argsort(-subset[candidates], kind="stable")]
+        return [item_ids[i] for i in order]
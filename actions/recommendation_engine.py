@@ -1,64 +1,127 @@
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional
+from .catalog import Catalog, get_catalog
+from .planner import FALLBACK_PATH, LearningPathPlanner, LearningPlan
+from .ranking import TfidfRanker, item_terms, profile_terms
+
+
+class CatalogSnapshot:
+    """Everything derived from one catalog: the catalog, its rankers and the compiled planner.
+
+    A snapshot is never modified after construction. A reload builds a new
+    snapshot and swaps it in; requests that already hold the old one finish on it.
+    """
+
+    def __init__(self, catalog: Catalog):
+        self.catalog = catalog
+        # One TF-IDF ranker per item kind, used for off-catalog domains and profile-aware ordering
+        # (compiled catalogs ship them prebuilt)
+        self.rankers = {}
+        prebuilt = getattr(catalog, "prebuilt_ranker", None)
+        for kind in ("course", "project", "career"):
+            ranker = prebuilt(kind) if prebuilt else None
+            if ranker is None:
+                ids = catalog.ids_of_kind(kind)
+                ranker = TfidfRanker(ids, (item_terms(catalog.items[i]) for i in ids))
+            self.rankers[kind] = ranker
+        # Stage graphs are compiled once; planning a path is then a lookup
+        self.planner = LearningPathPlanner(catalog.learning_paths)
+
 
 class RecommendationEngine:
-    def __init__(self):
-        # Mock database for recommendations
-        self.courses = {
-            "AI": [
-                {"title": "Machine Learning by Andrew Ng", "platform": "Coursera", "level": "Beginner"},
-                {"title": "Deep Learning Specialization", "platform": "Coursera", "level": "Intermediate"},
-                {"title": "Fast.ai Practical Deep Learning", "platform": "Fast.ai", "level": "Advanced"}
-            ],
-            "Web Development": [
-                {"title": "The Web Developer Bootcamp", "platform": "Udemy", "level": "Beginner"},
-                {"title": "Full Stack Open", "platform": "University of Helsinki", "level": "Intermediate"},
-                {"title": "Advanced React", "platform": "Frontend Masters", "level": "Advanced"}
-            ],
-            "Cybersecurity": [
-                {"title": "Introduction to Cyber Security", "platform": "FutureLearn", "level": "Beginner"},
-                {"title": "Cybersecurity Specialization", "platform": "Coursera", "level": "Intermediate"}
-            ]
-        }
-
-        self.projects = {
-            "AI": [
-                "Build a Chatbot using Rasa",
-                "Image Classification with CNN",
-                "Predicting House Prices using Regression"
-            ],
-            "Web Development": [
-                "Personal Portfolio Website",
-                "E-commerce Store",
-                "Task Management App"
-            ],
-            "Cybersecurity": [
-                "Keylogger in Python",
-                "Network Packet Sniffer",
-                "Password Strength Checker"
-            ]
-        }
-
-        self.career_paths = {
-            "AI": ["Machine Learning Engineer", "Data Scientist", "AI Research Scientist"],
-            "Web Development": ["Frontend Developer", "Backend Developer", "Full Stack Engineer"],
-            "Cybersecurity": ["Security Analyst", "Penetration Tester", "Security Engineer"]
-        }
+    def __init__(self, catalog: Optional[Catalog] = None, lazy: bool = False):
+        # The catalog is loaded once per process and shared read-only. A lazy engine builds its
+        # snapshot on first use (or when startup.warm_up gets to it), not in the constructor.
+        self._catalog = catalog
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._build_lock = threading.Lock()
+        if not lazy:
+            self._build()
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        return snapshot if snapshot is not None else self._build()
+
+    def _build(self) -> CatalogSnapshot:
+        with self._build_lock:
+            if self._snapshot is None:
+                self._snapshot = CatalogSnapshot(self._catalog or get_catalog())
+                self._catalog = None
+            return self._snapshot
+
+    @property
+    def catalog(self) -> Catalog:
+        return self.snapshot.catalog
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.catalog.version
+
+    def swap(self, snapshot: CatalogSnapshot) -> CatalogSnapshot:
+        """Atomically replace the current snapshot, returning the previous one."""
+        old, self._snapshot = self.snapshot, snapshot
+        return old
 
     def get_learning_path(self, domain: str) -> str:
-        paths = {
-            "AI": "Start with Python -> Math for ML -> Basic ML Algorithms -> Deep Learning -> NLP/CV",
-            "Web Development": "HTML/CSS -> JavaScript -> React/Vue -> Node.js -> Databases -> DevOps",
-            "Cybersecurity": "Networking Basics -> Linux -> Scripting (Python/Bash) -> Ethical Hacking -> Cloud Security"
-        }
-        return paths.get(domain, "I recommend starting with the basics of Computer Science and then specializing.")
-
-    def recommend_courses(self, domain: str, level: str = "Beginner") -> List[Dict[str, Any]]:
-        domain_courses = self.courses.get(domain, [])
-        # Filter by level if needed, for now return all for the domain
-        return domain_courses
-
-    def recommend_projects(self, domain: str) -> List[str]:
-        return self.projects.get(domain, ["Build a simple To-Do App", "Create a Calculator"])
-
-    def recommend_career(self, domain: str) -> List[str]:
-        return self.career_paths.get(domain, ["Software Engineer", "Technical Consultant"])
+        return self.snapshot.planner.display_path(domain) or FALLBACK_PATH
+
+    def plan_learning_path(self, domain: str, time_commitment: Any = "1 hour",
+                           skills: Optional[List[str]] = None) -> LearningPlan:
+        return self.snapshot.planner.plan(domain, time_commitment, skills or [])
+
+    def _recommend(self, kind: str, domain: str, level: Optional[str] = None,
+                   profile: Optional[Dict[str, Any]] = None, k: int = 5) -> List[Dict[str, Any]]:
+        # Read the snapshot once so a concurrent reload cannot mix two catalogs in one answer
+        snapshot = self.snapshot
+        catalog = snapshot.catalog
+        ranker = snapshot.rankers[kind]
+        terms = profile_terms(profile, domain)
+
+        # Known domain: exact index lookup; the k most similar to the profile when we have one,
+        # else the first k in catalog order
+        ids = []
+        if level:
+            ids = catalog.query_ids(kind, domain=domain, level=level)
+        if not ids:
+            ids = catalog.query_ids(kind, domain=domain)
+        if ids:
+            ids = ranker.rerank(ids, terms, k) if profile else ids[:k]
+            return [catalog.items[i] for i in ids]
+
+        # Off-catalog domain: rank the whole catalog against the domain and profile
+        return [catalog.items[i] for i, _ in ranker.top_k(terms, k)]
+
+    def recommend_courses(self, domain: str, level: Optional[str] = None,
+                          profile: Optional[Dict[str, Any]] = None, k: int = 5) -> List[Dict[str, Any]]:
+        return self._recommend("course", domain, level, profile, k)
+
+    def recommend_projects(self, domain: str, profile: Optional[Dict[str, Any]] = None) -> List[str]:
+        projects = [p["title"] for p in self._recommend("project", domain, profile=profile, k=3)]
+        return projects or ["Build a simple To-Do App", "Create a Calculator"]
+
+    def recommend_career(self, domain: str, profile: Optional[Dict[str, Any]] = None) -> List[str]:
+        careers = [c["title"] for c in self._recommend("career", domain, profile=profile, k=3)]
+        return careers or ["Software Engineer", "Technical Consultant"]
+
+
+_engine: Optional[RecommendationEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> RecommendationEngine:
+    """Return the process-wide engine. Its catalog and indexes are built on first use,
+    or ahead of it by `startup.start_warm_up`.
+
+    Unless CATALOG_WATCH_INTERVAL is 0, a background watcher reloads the
+    catalog when its file or directory changes.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from .catalog_watcher import start_watcher
+
+                _engine = RecommendationEngine(lazy=True)
+                start_watcher(_engine)
+    return _engine
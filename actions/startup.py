@@ -0,0 +1,224 @@
+"""Startup phases, background warm-up and readiness for the action server.
+
+Importing the actions only wires things together. The expensive part of
+boot (NumPy, loading the catalog, building its indexes and rankers, and the
+skill taxonomy) runs in `warm_up` on a background thread, so the server
+starts accepting requests right away. An action that needs the engine before
+warm-up finishes builds it on demand (whichever comes first does the work,
+the other waits for it).
+`is_ready()` flips once the indexes are built and a first query has run;
+`/ready` on the metrics port (and on `actions.prefork` workers) reports it.
+
+Each phase is timed. The breakdown is logged when the server becomes ready,
+exported as `startup_*` metrics, and printed by:
+
+    python -m actions.startup            # fresh process: import the actions, wait until ready
+    python -m actions.startup --max-ms 2000   # exit 1 if boot took longer
+"""
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_started = time.perf_counter()
+_phases: Dict[str, float] = {}
+_ready = threading.Event()
+_ready_seconds: Optional[float] = None
+
+
+_lazy_lock = threading.RLock()
+_lazy_loading = set()
+
+
+class _LazyModule(types.ModuleType):
+    """Placeholder installed by `lazy_import`; the first attribute access runs the module's code.
+
+    Unlike importlib.util.LazyLoader (before Python 3.12.3), the module stays
+    in this class until its code has finished, so another thread touching it
+    meanwhile waits for the import instead of seeing a half-initialized module.
+    """
+
+    def __getattribute__(self, attr):
+        with _lazy_lock:
+            spec = types.ModuleType.__getattribute__(self, "__spec__")
+            # Re-entrant access from the module's own import (its submodules) sees it as it stands
+            if type(self) is _LazyModule and spec.name not in _lazy_loading:
+                _lazy_loading.add(spec.name)
+                try:
+                    spec.loader.exec_module(self)
+                    self.__class__ = types.ModuleType
+                finally:
+                    _lazy_loading.discard(spec.name)
+        return types.ModuleType.__getattribute__(self, attr)
+
+
+def lazy_import(name: str):
+    """Return module `name`, executing it only when one of its attributes is first used."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    module = importlib.util.module_from_spec(spec)
+    module.__class__ = _LazyModule
+    sys.modules[name] = module
+    return module
+
+
+@contextmanager
+def phase(name: str):
+    """Time a startup phase; repeated phases add up."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = _phases.get(name, 0.0) + time.perf_counter() - start
+
+
+_last_checkpoint = _started
+
+
+def checkpoint(name: str):
+    """Record the time since the previous checkpoint (or since this module was imported) as phase `name`."""
+    global _last_checkpoint
+    now = time.perf_counter()
+    _phases[name] = _phases.get(name, 0.0) + now - _last_checkpoint
+    _last_checkpoint = now
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_ready(timeout: Optional[float] = None) -> bool:
+    return _ready.wait(timeout)
+
+
+def mark_ready():
+    global _ready_seconds
+    if _ready.is_set():
+        return
+    _ready_seconds = time.perf_counter() - _started
+    _ready.set()
+    logger.info("Action server ready in %.0f ms (%s)", _ready_seconds * 1000,
+                ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in _phases.items()))
+
+
+def report() -> Dict[str, object]:
+    return {
+        "ready": is_ready(),
+        "ready_ms": _ready_seconds * 1000 if _ready_seconds is not None else None,
+        "phases_ms": {name: seconds * 1000 for name, seconds in _phases.items()},
+    }
+
+
+def stats() -> Dict[str, float]:
+    """Phase durations and readiness as metrics (`startup_<phase>_seconds`, `startup_ready`)."""
+    values = {f"{name.replace(' ', '_')}_seconds": seconds for name, seconds in _phases.items()}
+    values["ready"] = 1 if is_ready() else 0
+    if _ready_seconds is not None:
+        values["ready_seconds"] = _ready_seconds
+    return values
+
+
+def serving_process() -> bool:
+    """False in the process `python -m rasa_sdk` only supervises from.
+
+    Sanic 22.9+ serves from worker processes that import the actions again,
+    so the launching process should not bind METRICS_PORT or warm up the engine.
+    """
+    main = sys.modules.get("__main__")
+    spec = getattr(main, "__spec__", None)
+    if spec is None or spec.name != "rasa_sdk.__main__" or "SANIC_WORKER_NAME" in os.environ:
+        return True
+    return importlib.util.find_spec("sanic.worker.manager") is None
+
+
+def warm_up(engine):
+    """Load the catalog and build the engine's indexes, then run one query and mark the server ready."""
+    from . import ranking
+    from .catalog import get_catalog
+    from .taxonomy import get_taxonomy
+
+    try:
+        with phase("numpy"):
+            ranking.np.ndarray  # noqa: B018 - first attribute access runs the deferred import
+        with phase("catalog"):
+            get_catalog()
+        with phase("indexes"):
+            snapshot = engine.snapshot
+        with phase("taxonomy"):
+            get_taxonomy()
+        with phase("first query"):
+            # Touch the planner, an index lookup and a ranker so the first real request is not the slow one
+            domain = next(iter(snapshot.catalog.learning_paths), "AI")
+            engine.plan_learning_path(domain)
+            engine.recommend_courses(domain, profile={"skills": ["python"]})
+            engine.recommend_career("warm up")
+    except Exception:
+        # Stay unready; actions will retry building the engine on demand and log the cause
+        logger.exception("Action server warm-up failed")
+        return
+    mark_ready()
+
+
+def start_warm_up(engine) -> threading.Thread:
+    thread = threading.Thread(target=warm_up, args=(engine,), name="startup-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# ============================================================================
+# Command line
+# ============================================================================
+
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import actions.actions
+from actions import startup
+imported = time.perf_counter()
+startup.wait_ready(600)
+result = startup.report()
+result["import_ms"] = (imported - started) * 1000
+result["total_ms"] = (time.perf_counter() - started) * 1000
+print(json.dumps(result))
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m actions.startup", description="Time action server startup by phase")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes to time (default 3); the fastest is shown")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    parser.add_argument("--max-ms", type=float, help="exit 1 if time to ready exceeds this")
+    args = parser.parse_args(argv)
+
+    results = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    best = min(results, key=lambda r: r["total_ms"])
+
+    if args.json:
+        print(json.dumps(best, indent=2))
+    else:
+        print(f"{'import actions (incl. rasa_sdk)':<34} {best['import_ms']:>9.1f} ms")
+        for name, ms in best["phases_ms"].items():
+            print(f"  {name:<32} {ms:>9.1f} ms")
+        print(f"{'total to ready':<34} {best['total_ms']:>9.1f} ms")
+    if args.max_ms is not None and best["total_ms"] > args.max_ms:
+        print(f"Startup took {best['total_ms']:.0f} ms, over the {args.max_ms:.0f} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+"""Canonical skills and interest domains, and fuzzy matching of free text onto them.
+
+Each concept has an id, the label stored in slots and shown to users, and
+aliases. All of them go into an exact index, under both their spaced and
+compact forms, so "Web Development", "web-dev" and "webdev" all find the
+same entry.
+
+Typos are corrected word by word, SymSpell-style. Every alias word is
+indexed under the strings it becomes after deleting up to 2 characters.
+An unknown word's own deletions are looked up in that index, and the
+candidates are confirmed by edit distance. A correction therefore costs a
+few dict probes, however many aliases there are, and is remembered. Words
+of 5 characters or fewer are never corrected, and a longer word only when
+exactly one alias word, with the same first letter, is close enough: short
+everyday words sit too close to short tool names ("none" and "node").
+
+A slot value like "basic pyhton and some ML" is then scanned for known
+phrases, longest first. Words in between that name nothing known are kept
+as the user wrote them, each run of them as an item of its own, so
+"Python, Tableau" yields Python and Tableau.
+
+The built-in table covers the shipped catalog. Set TAXONOMY_PATH to a JSON
+file of the same shape ({"skill": [{"id", "label", "aliases"}], "domain":
+[...]}) for other catalogs.
+"""
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .cache import LRUCache
+
+TAXONOMY_PATH = os.getenv("TAXONOMY_PATH")
+
+KINDS = ("skill", "domain")
+
+# (id, label, aliases); domain labels are the catalog's domain names
+DEFAULT_TAXONOMY = {
+    "domain": (
+        ("ai", "AI", ("artificial intelligence", "a.i.", "ai/ml", "ai ml", "machine learning", "ml",
+                      "deep learning", "neural networks", "nlp", "natural language processing",
+                      "computer vision")),
+        ("web-development", "Web Development", ("web dev", "web", "web design", "web developer",
+                                                "web apps", "web applications", "frontend", "backend",
+                                                "full stack", "website development")),
+        ("cybersecurity", "Cybersecurity", ("cyber security", "cyber", "security", "infosec",
+                                            "information security", "network security", "ethical hacking",
+                                            "hacking", "penetration testing", "pentesting")),
+    ),
+    "skill": (
+        ("python", "Python", ("py", "python3", "python 3")),
+        ("javascript", "JavaScript", ("js", "ecmascript", "es6")),
+        ("typescript", "TypeScript", ("ts",)),
+        ("java", "Java", ()),
+        ("c", "C", ("c language", "c programming")),
+        ("cpp", "C++", ("cpp", "c plus plus")),
+        ("csharp", "C#", ("c sharp", "csharp")),
+        ("dotnet", ".NET", ("dotnet", "dot net")),
+        ("go", "Go", ("golang",)),
+        ("rust", "Rust", ()),
+        ("sql", "SQL", ()),
+        ("mysql", "MySQL", ()),
+        ("postgresql", "PostgreSQL", ("postgres",)),
+        ("sqlite", "SQLite", ()),
+        ("databases", "Databases", ("database", "dbms", "nosql")),
+        ("mongodb", "MongoDB", ("mongo",)),
+        ("html", "HTML", ("html5",)),
+        ("css", "CSS", ("css3",)),
+        ("tailwind", "Tailwind CSS", ("tailwind", "tailwindcss")),
+        ("bootstrap", "Bootstrap", ()),
+        ("react", "React", ("reactjs", "react.js")),
+        ("nextjs", "Next.js", ("nextjs",)),
+        ("vue", "Vue.js", ("vue", "vuejs")),
+        ("angular", "Angular", ("angularjs",)),
+        ("nodejs", "Node.js", ("node", "nodejs")),
+        ("express", "Express", ("express.js", "expressjs")),
+        ("django", "Django", ()),
+        ("flask", "Flask", ()),
+        ("machine-learning", "Machine Learning", ("ml",)),
+        ("scikit-learn", "scikit-learn", ("sklearn", "scikit learn")),
+        ("deep-learning", "Deep Learning", ("dl", "neural networks")),
+        ("pytorch", "PyTorch", ("torch",)),
+        ("tensorflow", "TensorFlow", ("tf",)),
+        ("keras", "Keras", ()),
+        ("nlp", "NLP", ("natural language processing",)),
+        ("computer-vision", "Computer Vision", ()),
+        ("opencv", "OpenCV", ()),
+        ("data-analysis", "Data Analysis", ("data analytics",)),
+        ("pandas", "pandas", ()),
+        ("numpy", "NumPy", ()),
+        ("excel", "Excel", ("ms excel", "microsoft excel")),
+        ("statistics", "Statistics", ("stats", "probability")),
+        ("math", "Math", ("maths", "mathematics", "linear algebra", "calculus")),
+        ("linux", "Linux", ("unix", "ubuntu")),
+        ("bash", "Bash", ()),
+        ("shell-scripting", "Shell Scripting", ("shell", "scripting")),
+        ("git", "Git", ("version control",)),
+        ("github", "GitHub", ()),
+        ("networking", "Networking", ("computer networks", "networks", "tcp/ip")),
+        ("cloud", "Cloud", ("cloud computing",)),
+        ("aws", "AWS", ("amazon web services",)),
+        ("azure", "Azure", ("microsoft azure",)),
+        ("gcp", "Google Cloud", ("gcp", "google cloud platform")),
+        ("docker", "Docker", ("containers",)),
+        ("kubernetes", "Kubernetes", ("k8s",)),
+        ("security", "Security", ("cybersecurity", "cyber security", "infosec")),
+        ("ethical-hacking", "Ethical Hacking", ("hacking", "penetration testing", "pentesting")),
+        ("cryptography", "Cryptography", ("crypto",)),
+    ),
+}
+
+# Dots inside a word are kept, so "Next.js" and "Node.js" are one word and not "next" + "js" (JavaScript)
+_WORD_RE = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*", re.IGNORECASE)
+# Punctuation between list items ("Rust, Excel; Tableau"); unmatched words are not joined across it
+_ITEM_BREAK_RE = re.compile(r"[,;|\n]")
+
+# Filler and negation words: never typo-corrected and never kept as unmatched text,
+# but still matched when they are an alias themselves ("go" is the Go skill)
+STOPWORDS = frozenset(("a", "an", "and", "or", "the", "of", "in", "on", "to", "with", "for", "at", "i", "im",
+                       "my", "me", "some", "basic", "basics", "bit", "little", "know", "learn", "learning",
+                       "want", "like", "into", "go", "good", "also", "no", "not", "none", "nothing", "nope",
+                       "nah", "n", "na", "yet", "so", "far", "any", "rest", "note", "taking"))
+
+# Longest phrase (in words) tried while scanning text for concepts
+MAX_WORDS = 4
+# Corrected words remembered per kind; the table is emptied when full
+CORRECTIONS_SIZE = 10000
+
+
+def words(text: Any) -> List[str]:
+    """Lower-cased words of `text`; "+" and "#" are kept so "C++" and "C#" survive."""
+    return [word.casefold() for word in _WORD_RE.findall(str(text))]
+
+
+def max_distance(length: int) -> int:
+    """Edits tolerated in a word of `length` characters: none up to 5 ("none" is not "node"), then 1, then 2 from 9."""
+    return 0 if length <= 5 else 1 if length <= 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent transpositions count as one edit), or limit + 1 once over it."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] * (len(b) + 1)
+        for j in range(1, len(b) + 1):
+            value = previous[j - 1] if a[i - 1] == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1] and before[j - 2] + 1 < value:
+                value = before[j - 2] + 1
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _deletes(word: str, depth: int) -> Set[str]:
+    """`word` and every string left after deleting up to `depth` of its characters."""
+    found, frontier = {word}, {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+@dataclass(frozen=True)
+class Concept:
+    id: str
+    kind: str
+    label: str
+    aliases: Tuple[str, ...] = ()
+
+
+class _Index:
+    """Exact phrase lookups and typo correction over the aliases of one kind of concept."""
+
+    def __init__(self, concepts: Iterable[Concept]):
+        self.exact: Dict[str, Concept] = {}
+        # Every word of every alias, plus multi-word aliases run together ("webdev")
+        self.vocabulary: Set[str] = set()
+        for concept in concepts:
+            for alias in (concept.label, concept.id) + concept.aliases:
+                tokens = words(alias)
+                if not tokens:
+                    continue
+                # The first concept to claim an alias keeps it
+                self.exact.setdefault(" ".join(tokens), concept)
+                self.exact.setdefault("".join(tokens), concept)
+                self.vocabulary.update(tokens)
+                self.vocabulary.add("".join(tokens))
+        self.deletes: Dict[str, List[str]] = {}
+        for word in sorted(self.vocabulary):
+            for variant in _deletes(word, max_distance(len(word))):
+                self.deletes.setdefault(variant, []).append(word)
+        self._corrections: Dict[str, str] = {}
+
+    def lookup(self, tokens: Sequence[str]) -> Optional[Concept]:
+        return self.exact.get(" ".join(tokens)) or self.exact.get("".join(tokens))
+
+    def correct(self, word: str) -> str:
+        """The vocabulary word within `max_distance` edits of `word`, or `word` itself.
+
+        Only an unambiguous correction is made: exactly one candidate, starting
+        with the same letter.
+        """
+        corrected = self._corrections.get(word)
+        if corrected is not None:
+            return corrected
+        corrected = word
+        limit = max_distance(len(word))
+        # Dotted names ("Nuxt.js") are written on purpose, not mistyped
+        if limit and word not in self.vocabulary and word not in STOPWORDS and "." not in word:
+            candidates = {c for variant in _deletes(word, limit) for c in self.deletes.get(variant, ())}
+            close = []
+            for candidate in candidates:
+                allowed = min(limit, max_distance(len(candidate)))
+                if edit_distance(word, candidate, allowed) <= allowed:
+                    close.append(candidate)
+            if len(close) == 1 and close[0][0] == word[0]:
+                corrected = close[0]
+        if len(self._corrections) >= CORRECTIONS_SIZE:
+            self._corrections.clear()
+        self._corrections[word] = corrected
+        return corrected
+
+
+class Taxonomy:
+    """Concepts of each kind ("skill", "domain") and the matcher that maps free text onto them."""
+
+    def __init__(self, concepts: Iterable[Concept]):
+        by_kind: Dict[str, List[Concept]] = {kind: [] for kind in KINDS}
+        self.concepts: Dict[Tuple[str, str], Concept] = {}
+        for concept in concepts:
+            by_kind.setdefault(concept.kind, []).append(concept)
+            self.concepts[(concept.kind, concept.id)] = concept
+        self._indexes = {kind: _Index(items) for kind, items in by_kind.items()}
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "Taxonomy":
+        """Build from {"skill": [...], "domain": [...]}, entries being (id, label, aliases) or dicts."""
+        concepts = []
+        for kind, entries in spec.items():
+            for entry in entries:
+                if isinstance(entry, dict):
+                    entry = (entry["id"], entry.get("label") or entry["id"], entry.get("aliases") or ())
+                concept_id, label, aliases = entry
+                concepts.append(Concept(concept_id, kind, label, tuple(aliases)))
+        return cls(concepts)
+
+    def _words(self, index: _Index, text: Any) -> List[str]:
+        return [index.correct(word) for word in words(text)]
+
+    def match(self, kind: str, text: Any) -> Optional[Concept]:
+        """The concept `text` names as a whole, allowing for typos, or None."""
+        index = self._indexes[kind]
+        tokens = self._words(index, text)
+        return index.lookup(tokens) if tokens else None
+
+    def scan(self, kind: str, text: Any) -> List[Union[Concept, str]]:
+        """`text` as the concepts it mentions, in order, and the words between them that name none.
+
+        The whole text is tried first, then its phrases longest first. Unmatched
+        words are returned as written, one string per run of them; stopwords and
+        list punctuation end a run.
+        """
+        index = self._indexes[kind]
+        text = str(text)
+        written: List[str] = []
+        breaks: List[bool] = []
+        end = 0
+        for m in _WORD_RE.finditer(text):
+            breaks.append(_ITEM_BREAK_RE.search(text, end, m.start()) is not None)
+            written.append(m.group())
+            end = m.end()
+        tokens = [index.correct(word.casefold()) for word in written]
+        if not tokens:
+            return []
+        whole = index.lookup(tokens)
+        if whole is not None:
+            return [whole]
+
+        found: List[Union[Concept, str]] = []
+        run: List[str] = []
+
+        def end_run():
+            if run:
+                found.append(" ".join(run))
+                run.clear()
+
+        i = 0
+        while i < len(tokens):
+            if breaks[i]:
+                end_run()
+            concept, size = None, 1
+            for size in range(min(MAX_WORDS, len(tokens) - i), 0, -1):
+                concept = index.lookup(tokens[i:i + size])
+                if concept is not None:
+                    break
+            if concept is not None:
+                end_run()
+                if concept not in found:
+                    found.append(concept)
+                i += size
+                continue
+            if tokens[i] in STOPWORDS:
+                end_run()
+            else:
+                run.append(written[i])
+            i += 1
+        end_run()
+        return found
+
+    def find(self, kind: str, text: Any) -> List[Concept]:
+        """Every concept mentioned in `text`, in order: the whole text first, else its phrases longest first."""
+        return [item for item in self.scan(kind, text) if isinstance(item, Concept)]
+
+    def normalize(self, kind: str, values: Iterable[Any]) -> List[str]:
+        """Canonical labels of the concepts in `values`, in order and without duplicates.
+
+        Words that name no known concept are kept as written, as items of their
+        own; a value that names none at all is kept whole, trimmed, unless it is
+        only filler ("none so far").
+        """
+        result: List[str] = []
+        seen: Set[str] = set()
+        for value in values:
+            if value is None:
+                continue
+            items = self.scan(kind, value)
+            if any(isinstance(item, Concept) for item in items):
+                labels = [item.label if isinstance(item, Concept) else item for item in items]
+            else:
+                labels = [str(value).strip()] if items else []
+            for label in labels:
+                if label and label.casefold() not in seen:
+                    seen.add(label.casefold())
+                    result.append(label)
+        return result
+
+    def resolve(self, kind: str, text: Any) -> Any:
+        """The label of the first concept in `text`, or `text` unchanged when there is none."""
+        found = self.find(kind, text) if text else []
+        return found[0].label if found else text
+
+    def ids(self, kind: str, values: Iterable[Any]) -> Set[str]:
+        return {c.id for value in values or () if value for c in self.find(kind, value)}
+
+
+def load_taxonomy(path: Optional[str] = None) -> Taxonomy:
+    path = path or TAXONOMY_PATH
+    if not path:
+        return Taxonomy.from_spec(DEFAULT_TAXONOMY)
+    with open(path, encoding="utf-8") as f:
+        return Taxonomy.from_spec(json.load(f))
+
+
+_taxonomy: Optional[Taxonomy] = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> Taxonomy:
+    """The process-wide taxonomy, built on first use (or by `startup.warm_up`)."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = load_taxonomy()
+    return _taxonomy
+
+
+# Profile slots and the kind of concept each holds; list slots are normalized item by item
+PROFILE_FIELDS = (("skills", "skill"), ("interests", "domain"), ("target_domain", "domain"))
+
+
+def normalize_profile(profile: Dict[str, Any], taxonomy: Optional[Taxonomy] = None) -> Dict[str, Any]:
+    """A copy of `profile` with skills, interests and target_domain mapped to canonical labels."""
+    taxonomy = taxonomy or get_taxonomy()
+    normalized = dict(profile)
+    for field, kind in PROFILE_FIELDS:
+        value = profile.get(field)
+        if not value:
+            continue
+        if isinstance(value, (list, tuple)):
+            normalized[field] = taxonomy.normalize(kind, value)
+        else:
+            normalized[field] = taxonomy.resolve(kind, value)
+    return normalized
+
+
+class SenderCache:
+    """Normalized profile fields per sender.
+
+    A conversation sends the same few skills and interests on every turn, so
+    each sender keeps the raw -> normalized mapping of its recent values
+    (at most `per_sender` of them) and repeat turns skip the matcher.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = None, per_sender: int = 32):
+        self.per_sender = per_sender
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def normalize_profile(self, sender_id: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        seen: Optional[Dict[tuple, Any]] = self._cache.get(sender_id)
+        if seen is None:
+            seen = {}
+            self._cache.set(sender_id, seen)
+        taxonomy = get_taxonomy()
+        normalized = dict(profile)
+        for field, kind in PROFILE_FIELDS:
+            value = profile.get(field)
+            if not value:
+                continue
+            key = (kind, tuple(value) if isinstance(value, (list, tuple)) else value)
+            result = seen.get(key)
+            if result is None:
+                result = normalize_profile({field: value}, taxonomy)[field]
+                if len(seen) >= self.per_sender:
+                    seen.clear()
+                seen[key] = result
+            normalized[field] = list(result) if isinstance(result, list) else result
+        return normalized
+
+    def invalidate(self, sender_id: str):
+        self._cache.invalidate(sender_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
@@ -1,5 +1,14 @@
 def format_list(items: list) -> str:
     return "\n".join([f"- {item}" for item in items])
 
+def format_course(c: dict) -> str:
+    # platform and level are optional in JSONL and SQLite catalogs
+    line = f"- {c.get('title', 'Untitled course')}"
+    if c.get('platform'):
+        line += f" ({c['platform']})"
+    if c.get('level'):
+        line += f" [{c['level']}]"
+    return line
+
 def format_courses(courses: list) -> str:
-    return "\n".join([f"- {c['title']} ({c['platform']}) [{c['level']}]" for c in courses])
+    return "\n".join([format_course(c) for c in courses])
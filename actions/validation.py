@@ -0,0 +1,169 @@
+"""Table-driven validation and normalization of profile form slots.
+
+Each slot has a `SlotRule`: a normalizer that returns the cleaned value, or
+None when the input is not acceptable, and the message to send back in that
+case. `FormValidator.validate` checks every slot a message filled in one
+pass. Patterns are compiled once at import, and number words are parsed per
+token, so "someone" is not read as "one". Skills and interests are mapped to
+their canonical labels (see taxonomy), so "ml, pyhton" is stored as
+["Machine Learning", "Python"].
+"""
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .taxonomy import get_taxonomy
+
+_TOKEN_RE = re.compile(r"[a-z]+|\d+(?:\.\d+)?")
+_DECIMAL_RE = re.compile(r"\d+(?:\.\d+)?")
+_LIST_SEPARATORS_RE = re.compile(r"[;,]")
+
+_UNITS = ("zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+          "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen")
+_UNIT_ORDINALS = ("zeroth", "first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth",
+                  "tenth", "eleventh", "twelfth", "thirteenth", "fourteenth", "fifteenth", "sixteenth",
+                  "seventeenth", "eighteenth", "nineteenth")
+_TENS = ("", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety")
+_TEN_ORDINALS = ("", "", "twentieth", "thirtieth", "fortieth", "fiftieth", "sixtieth", "seventieth",
+                 "eightieth", "ninetieth")
+
+# Number word -> (value, is a tens word that may be followed by a unit, as in "twenty one")
+NUMBER_WORDS: Dict[str, Tuple[int, bool]] = {}
+for _n, (_word, _ordinal) in enumerate(zip(_UNITS, _UNIT_ORDINALS)):
+    NUMBER_WORDS[_word] = NUMBER_WORDS[_ordinal] = (_n, False)
+for _n, (_word, _ordinal) in enumerate(zip(_TENS, _TEN_ORDINALS)):
+    if _word:
+        NUMBER_WORDS[_word] = (_n * 10, True)
+        NUMBER_WORDS[_ordinal] = (_n * 10, False)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word and number tokens; "5th" and "twenty-one" split as "5", "th" and "twenty", "one"."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def parse_number(text: Any) -> Optional[int]:
+    """The first whole number in `text`, written as digits ("5", "5th") or words ("five", "fifth", "twenty one")."""
+    tokens = tokenize(str(text))
+    for i, token in enumerate(tokens):
+        if token.isdigit():
+            return int(token)
+        entry = NUMBER_WORDS.get(token)
+        if entry is not None:
+            value, takes_unit = entry
+            if takes_unit and i + 1 < len(tokens):
+                unit = NUMBER_WORDS.get(tokens[i + 1])
+                if unit is not None and 0 < unit[0] < 10:
+                    value += unit[0]
+            return value
+    return None
+
+
+def parse_decimal(value: Any) -> Optional[float]:
+    """A number as float: the value itself if it converts, else the first decimal number in its text."""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        match = _DECIMAL_RE.search(str(value))
+        if match is None:
+            return None
+        number = float(match.group())
+    return number if math.isfinite(number) else None
+
+
+def split_list(value: Any) -> List[str]:
+    """A list slot: lists are kept, text is split on "," or ";"."""
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if v]
+    return [part.strip() for part in _LIST_SEPARATORS_RE.split(str(value)) if part.strip()]
+
+
+# ============================================================================
+# Slot rules
+# ============================================================================
+
+@dataclass(frozen=True)
+class SlotRule:
+    slot: str
+    normalize: Callable[[Any], Any]  # cleaned value, or None if the input is not acceptable
+    error: str                       # sent when `normalize` rejects the input
+    missing: Optional[str] = None    # sent instead of `error` when there is no input at all
+
+
+def _degree(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) and len(value) > 1 else None
+
+
+def _semester(value: Any) -> Optional[str]:
+    number = parse_number(value)
+    return str(number) if number is not None and 1 <= number <= 12 else None
+
+
+def _gpa(value: Any) -> Optional[str]:
+    # 0-4 and 0-10 scales are both accepted
+    number = parse_decimal(value)
+    return str(number) if number is not None and 0.0 <= number <= 10.0 else None
+
+
+def _skills(value: Any) -> Optional[List[str]]:
+    return get_taxonomy().normalize("skill", split_list(value)) or None
+
+
+def _interests(value: Any) -> Optional[List[str]]:
+    return get_taxonomy().normalize("domain", split_list(value)) or None
+
+
+def _text(value: Any) -> Optional[str]:
+    return str(value) if value else None
+
+
+def _stripped_text(value: Any) -> Optional[str]:
+    return str(value).strip() or None
+
+
+PROFILE_RULES = (
+    SlotRule("degree", _degree, "I didn't get your degree clearly. Which degree are you pursuing?"),
+    SlotRule("semester", _semester, "Please provide your semester as a number (for example: 5 or '5th').",
+             missing="Please provide your semester as a number, e.g. 5"),
+    SlotRule("gpa", _gpa, "Please provide your GPA as a number (for example: 3.5 or 7.2)."),
+    SlotRule("skills", _skills, "Please list at least one technical skill you have."),
+    SlotRule("time_commitment", _text, "How much time can you commit to learning daily? (e.g., 1 hour)"),
+    SlotRule("interests", _interests, "What are your areas of interest? (e.g., AI, Web Development)"),
+    SlotRule("learning_goal", _stripped_text,
+             "Please tell me your learning goal (e.g., 'Learn AI', 'Become a web developer')"),
+)
+
+
+class FormValidator:
+    """Validates and normalizes form slots against a table of rules; slots without a rule pass through."""
+
+    def __init__(self, rules: Iterable[SlotRule]):
+        self.rules: Dict[str, SlotRule] = {rule.slot: rule for rule in rules}
+
+    def validate_slot(self, slot: str, value: Any) -> Tuple[Any, Optional[str]]:
+        """(normalized value, None) when `value` is acceptable, else (None, message for the user)."""
+        rule = self.rules.get(slot)
+        if rule is None:
+            return value, None
+        if value is None or value == "" or value == []:
+            return None, rule.missing or rule.error
+        normalized = rule.normalize(value)
+        if normalized is None:
+            return None, rule.error
+        return normalized, None
+
+    def validate(self, slots: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """Validate every slot in one pass: normalized values (None where rejected) and the messages to send."""
+        values: Dict[str, Any] = {}
+        messages: List[str] = []
+        for slot, value in slots.items():
+            values[slot], message = self.validate_slot(slot, value)
+            if message:
+                messages.append(message)
+        return values, messages
+
+
+profile_validator = FormValidator(PROFILE_RULES)
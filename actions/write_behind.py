@@ -0,0 +1,196 @@
+import asyncio
+import atexit
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from .db import Database
+
+logger = logging.getLogger(__name__)
+
+
+def _non_null(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in data.items() if v is not None}
+
+
+class WriteBehindBuffer:
+    """Coalescing write-behind queue in front of Database.save_profiles.
+
+    `put` only touches an in-memory dict: repeated saves for the same user
+    within a flush window are merged into one pending row. A background task
+    writes pending rows in batches every `window` seconds, or sooner once
+    `max_batch` users are waiting. At most `max_pending` users are buffered;
+    beyond that `put` waits for a flush (back-pressure). Pending rows are
+    flushed on `close()` and, as a last resort, at interpreter exit.
+    """
+
+    def __init__(self, db: Database, window: Optional[float] = None,
+                 max_batch: Optional[int] = None, max_pending: Optional[int] = None):
+        self.db = db
+        self.window = float(window or os.getenv("PROFILE_FLUSH_INTERVAL", "0.5"))
+        self.max_batch = int(max_batch or os.getenv("PROFILE_FLUSH_BATCH", "200"))
+        self.max_pending = int(max_pending or os.getenv("PROFILE_MAX_PENDING", "10000"))
+
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Condition] = None
+        self._closed = False
+
+        self.enqueued = 0
+        self.coalesced_writes = 0
+        self.flushed_writes = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.backpressure_waits = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+        atexit.register(self._flush_at_exit)
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._space = asyncio.Condition()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def put(self, user_id: str, data: Dict[str, Any]):
+        if self._closed:
+            await self.db.save_profile(user_id, data)
+            return
+        self._ensure_started()
+        self.enqueued += 1
+
+        pending = self._pending.get(user_id)
+        if pending is not None:
+            pending.update(_non_null(data))
+            self.coalesced_writes += 1
+            return
+
+        if len(self._pending) >= self.max_pending:
+            self.backpressure_waits += 1
+            self._wakeup.set()
+            async with self._space:
+                await self._space.wait_for(lambda: len(self._pending) < self.max_pending)
+            # Another save for this user may have been queued while we waited
+            if user_id in self._pending:
+                self._pending[user_id].update(_non_null(data))
+                self.coalesced_writes += 1
+                return
+
+        self._pending[user_id] = _non_null(data)
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    def pending_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Not-yet-persisted fields for the user, so readers can see their own writes."""
+        inflight = self._inflight.get(user_id)
+        pending = self._pending.get(user_id)
+        if inflight is None and pending is None:
+            return None
+        return {**(inflight or {}), **(pending or {})}
+
+    async def delete(self, user_id: str):
+        """Drop the user's unsaved fields and delete their stored profile."""
+        self._pending.pop(user_id, None)
+        if user_id in self._inflight and self._space is not None:
+            # A batch being written now could land after the delete; let it finish first
+            async with self._space:
+                await self._space.wait_for(lambda: user_id not in self._inflight)
+            # A failed flush puts its rows back into pending
+            self._pending.pop(user_id, None)
+        await self.db.delete_profile(user_id)
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.window)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Write everything pending, in batches of at most max_batch users."""
+        while self._pending:
+            batch = {}
+            for user_id in list(self._pending)[:self.max_batch]:
+                batch[user_id] = self._pending.pop(user_id)
+            self._inflight.update(batch)
+            if self._space is not None:
+                async with self._space:
+                    self._space.notify_all()
+
+            start = time.perf_counter()
+            try:
+                await self.db.save_profiles(batch)
+            except Exception:
+                self.flush_errors += 1
+                logger.exception("Profile flush of %d rows failed; will retry", len(batch))
+                # Put the rows back underneath anything newer and retry on the next tick
+                for user_id, data in batch.items():
+                    self._pending[user_id] = {**data, **self._pending.get(user_id, {})}
+                return
+            finally:
+                for user_id in batch:
+                    self._inflight.pop(user_id, None)
+                if self._space is not None:
+                    async with self._space:
+                        self._space.notify_all()
+
+            elapsed = time.perf_counter() - start
+            self.flushes += 1
+            self.flushed_writes += len(batch)
+            self.last_flush_seconds = elapsed
+            self.total_flush_seconds += elapsed
+            self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+
+    async def close(self):
+        self._closed = True
+        if self._task is not None:
+            self._wakeup.set()
+            try:
+                await self._task
+            except Exception:
+                logger.exception("Profile flush task failed")
+            self._task = None
+        await self.flush()
+
+    def _flush_at_exit(self):
+        rows = {**self._inflight}
+        for user_id, data in self._pending.items():
+            rows[user_id] = {**rows.get(user_id, {}), **data}
+        if not rows:
+            return
+        self._pending.clear()
+        self._inflight.clear()
+        # The event loop that owned the pool is gone; write through a fresh one
+        self.db.reset()
+
+        async def save():
+            try:
+                await self.db.save_profiles(rows)
+            finally:
+                await self.db.close()
+
+        try:
+            asyncio.run(save())
+        except Exception:
+            logger.exception("Could not flush %d profiles at exit", len(rows))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": len(self._pending) + len(self._inflight),
+            "enqueued": self.enqueued,
+            "coalesced_writes": self.coalesced_writes,
+            "flushed_writes": self.flushed_writes,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "backpressure_waits": self.backpressure_waits,
+            "last_flush_seconds": self.last_flush_seconds,
+            "max_flush_seconds": self.max_flush_seconds,
+            "avg_flush_seconds": self.total_flush_seconds / self.flushes if self.flushes else 0.0,
+        }
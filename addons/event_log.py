@@ -0,0 +1,297 @@
+"""Append-only, compactly encoded conversation event log on SQLite.
+
+Storage for `addons.tracker_store.SQLiteTrackerStore`, kept free of Rasa
+imports. Each save appends one row holding only the events that are new
+since the previous save. A row is a chunk of events, serialized with msgpack
+and compressed with zstd. Without those packages, JSON and zlib are used.
+The codec is recorded per row, so rows written either way stay readable.
+
+A chunk never spans a session start (`action_session_start`). Loading the
+current session therefore reads only the rows from its start. When a new
+session starts, the chunks of the one before it are merged into a single
+row, which compresses far better than many small ones, and sessions beyond
+`keep_sessions` are dropped. Conversations idle for longer than
+`retention_days` are deleted by a periodic sweep.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # JSON instead
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # zlib instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Codec bits recorded with every chunk
+MSGPACK = 1
+ZSTD = 2
+ZLIB = 4
+
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+# Payloads smaller than this are stored uncompressed
+COMPRESS_MIN_BYTES = 128
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS conversations (
+        sender_id TEXT PRIMARY KEY,
+        events INTEGER NOT NULL,          -- events ever appended; the next event's seq
+        session_start INTEGER NOT NULL,   -- seq of the latest session's first event
+        updated REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS conversations_updated ON conversations (updated)",
+    """CREATE TABLE IF NOT EXISTS chunks (
+        sender_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,             -- seq of the chunk's first event
+        session INTEGER NOT NULL,         -- seq of the session start the chunk belongs to
+        count INTEGER NOT NULL,
+        codec INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        PRIMARY KEY (sender_id, seq)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS sessions (
+        sender_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        started REAL NOT NULL,            -- timestamp of the session start event
+        PRIMARY KEY (sender_id, seq)
+    ) WITHOUT ROWID""",
+)
+
+
+def is_session_start(event: Dict[str, Any]) -> bool:
+    return event.get("event") == "action" and event.get("name") == "action_session_start"
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+_codec_local = threading.local()
+
+
+def _zstd():
+    # zstandard compressor and decompressor objects are not thread-safe; keep one pair per thread
+    pair = getattr(_codec_local, "zstd", None)
+    if pair is None:
+        pair = _codec_local.zstd = (zstandard.ZstdCompressor(level=ZSTD_LEVEL), zstandard.ZstdDecompressor())
+    return pair
+
+
+def encode(events: List[Dict[str, Any]]) -> Tuple[int, bytes]:
+    """(codec, payload) for a list of event dicts, using the most compact codec installed."""
+    if msgpack is not None:
+        codec, data = MSGPACK, msgpack.packb(events, use_bin_type=True)
+    else:
+        codec, data = 0, json.dumps(events, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(data) < COMPRESS_MIN_BYTES:
+        return codec, data
+    if zstandard is not None:
+        compressed, flag = _zstd()[0].compress(data), ZSTD
+    else:
+        compressed, flag = zlib.compress(data, ZLIB_LEVEL), ZLIB
+    return (codec | flag, compressed) if len(compressed) < len(data) else (codec, data)
+
+
+def decode(codec: int, data: bytes) -> List[Dict[str, Any]]:
+    if codec & ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Tracker events were stored with zstd; install the zstandard package to read them")
+        data = _zstd()[1].decompress(data)
+    elif codec & ZLIB:
+        data = zlib.decompress(data)
+    if codec & MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("Tracker events were stored with msgpack; install the msgpack package to read them")
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+
+def _split_sessions(first_seq: int, events: List[Dict[str, Any]]) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    """(seq, events) chunks of consecutive events, starting a new chunk at each session start."""
+    chunks: List[Tuple[int, List[Dict[str, Any]]]] = []
+    for offset, event in enumerate(events):
+        if not chunks or (is_session_start(event) and chunks[-1][1]):
+            chunks.append((first_seq + offset, []))
+        chunks[-1][1].append(event)
+    return chunks
+
+
+# ============================================================================
+# Log
+# ============================================================================
+
+class EventLog:
+    """Conversation events per sender_id in one SQLite file (WAL mode).
+
+    Methods are synchronous and safe to call from several threads; each
+    thread gets its own connection. A save for one sender must not run
+    concurrently with another for the same sender (Rasa serializes them
+    with its lock store).
+    """
+
+    def __init__(self, path: str, retention_days: float = 30, keep_sessions: int = 0,
+                 sweep_interval: float = 3600):
+        self.path = path
+        self.retention_days = retention_days
+        self.keep_sessions = keep_sessions
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._last_sweep = 0.0
+        with self._conn() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+        self.sweep()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    # ---- reads ---------------------------------------------------------
+
+    def load(self, sender_id: str, full: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Events of the latest session (all retained sessions if `full`), or None for an unknown sender."""
+        conn = self._conn()
+        row = conn.execute("SELECT session_start FROM conversations WHERE sender_id = ?", (sender_id,)).fetchone()
+        if row is None:
+            return None
+        start = 0 if full else row[0]
+        events: List[Dict[str, Any]] = []
+        for codec, data in conn.execute(
+                "SELECT codec, data FROM chunks WHERE sender_id = ? AND seq >= ? ORDER BY seq", (sender_id, start)):
+            events.extend(decode(codec, data))
+        return events
+
+    def stored(self, sender_id: str, first_event: Optional[Dict[str, Any]]) -> int:
+        """How many events of a tracker beginning with `first_event` are already in the log.
+
+        A tracker holds the events from one of the sender's session starts
+        (the latest one when it was loaded), or from the beginning of the
+        conversation. Its events from that point on were appended in order.
+        """
+        conn = self._conn()
+        row = conn.execute("SELECT events FROM conversations WHERE sender_id = ?", (sender_id,)).fetchone()
+        if row is None or first_event is None:
+            return 0
+        base = 0
+        if is_session_start(first_event):
+            found = conn.execute(
+                "SELECT seq FROM sessions WHERE sender_id = ? AND started = ? ORDER BY seq DESC LIMIT 1",
+                (sender_id, first_event.get("timestamp")),
+            ).fetchone()
+            if found is None:
+                # A new session that has not been saved yet
+                return 0
+            base = found[0]
+        return max(0, row[0] - base)
+
+    def senders(self) -> List[str]:
+        return [row[0] for row in self._conn().execute("SELECT sender_id FROM conversations")]
+
+    def exists(self, sender_id: str) -> bool:
+        return self._conn().execute(
+            "SELECT 1 FROM conversations WHERE sender_id = ?", (sender_id,)).fetchone() is not None
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        conversations, events = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(events), 0) FROM conversations").fetchone()
+        chunks, stored_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM chunks").fetchone()
+        return {"conversations": conversations, "events": events, "chunks": chunks, "bytes": stored_bytes}
+
+    # ---- writes --------------------------------------------------------
+
+    def append(self, sender_id: str, events: List[Dict[str, Any]]):
+        """Append new events for `sender_id`; a session start among them compacts the sessions before it."""
+        if not events:
+            return
+        now = time.time()
+        with self._conn() as conn:
+            row = conn.execute("SELECT events, session_start FROM conversations WHERE sender_id = ?",
+                               (sender_id,)).fetchone()
+            next_seq, session = row if row else (0, 0)
+            previous_session = session
+            rows, starts = [], []
+            for seq, chunk in _split_sessions(next_seq, events):
+                if is_session_start(chunk[0]):
+                    session = seq
+                    starts.append((sender_id, seq, chunk[0].get("timestamp") or now))
+                codec, data = encode(chunk)
+                rows.append((sender_id, seq, session, len(chunk), codec, data))
+            conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)", starts)
+            conn.execute(
+                "INSERT INTO conversations VALUES (?, ?, ?, ?) ON CONFLICT (sender_id) DO UPDATE SET"
+                " events = excluded.events, session_start = excluded.session_start, updated = excluded.updated",
+                (sender_id, next_seq + len(events), session, now))
+            if starts:
+                self._compact(conn, sender_id, previous_session, session)
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+
+    def _compact(self, conn: sqlite3.Connection, sender_id: str, previous_session: int, session: int):
+        # The sessions before `session` are finished: merge each one's chunks into a single row
+        finished = conn.execute(
+            "SELECT DISTINCT session FROM chunks WHERE sender_id = ? AND session >= ? AND session < ?",
+            (sender_id, previous_session, session)).fetchall()
+        for (finished_session,) in finished:
+            chunks = conn.execute(
+                "SELECT seq, codec, data FROM chunks WHERE sender_id = ? AND session = ? ORDER BY seq",
+                (sender_id, finished_session)).fetchall()
+            if len(chunks) < 2:
+                continue
+            events = [event for _, codec, data in chunks for event in decode(codec, data)]
+            codec, data = encode(events)
+            conn.execute("DELETE FROM chunks WHERE sender_id = ? AND session = ?", (sender_id, finished_session))
+            conn.execute("INSERT INTO chunks VALUES (?, ?, ?, ?, ?, ?)",
+                         (sender_id, chunks[0][0], finished_session, len(events), codec, data))
+
+        if self.keep_sessions > 0:
+            oldest_kept = conn.execute(
+                "SELECT seq FROM sessions WHERE sender_id = ? ORDER BY seq DESC LIMIT 1 OFFSET ?",
+                (sender_id, self.keep_sessions - 1)).fetchone()
+            if oldest_kept is not None:
+                conn.execute("DELETE FROM chunks WHERE sender_id = ? AND session < ?", (sender_id, oldest_kept[0]))
+                conn.execute("DELETE FROM sessions WHERE sender_id = ? AND seq < ?", (sender_id, oldest_kept[0]))
+
+    def sweep(self) -> int:
+        """Delete conversations idle for longer than `retention_days`; returns how many were deleted."""
+        self._last_sweep = time.time()
+        if self.retention_days <= 0:
+            return 0
+        cutoff = self._last_sweep - self.retention_days * 86400
+        with self._conn() as conn:
+            expired = [row[0] for row in conn.execute(
+                "SELECT sender_id FROM conversations WHERE updated < ?", (cutoff,))]
+            for table in ("chunks", "sessions", "conversations"):
+                conn.executemany(f"DELETE FROM {table} WHERE sender_id = ?", ((s,) for s in expired))
+        if expired:
+            logger.info("Deleted %d conversations idle for more than %g days", len(expired), self.retention_days)
+        return len(expired)
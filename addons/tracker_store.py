@@ -0,0 +1,78 @@
+"""Rasa tracker store on a local SQLite file, with compactly encoded events.
+
+Enable it in endpoints.yml (Rasa 3.5+; the project directory must be the
+working directory of `rasa run` so `addons` is importable):
+
+    tracker_store:
+      type: addons.tracker_store.SQLiteTrackerStore
+      db: trackers.db          # SQLite file
+      retention_days: 30       # delete conversations idle for longer (0 keeps them)
+      keep_sessions: 0         # sessions kept per conversation (0 keeps all)
+
+Conversations survive restarts and stay out of the Rasa server's memory.
+Each save appends only the tracker's new events (see `addons.event_log` for
+the format, compaction and retention). Database calls run on a small thread
+pool, so the event loop does not wait on SQLite.
+"""
+import asyncio
+import itertools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional, Text
+
+from rasa.core.brokers.broker import EventBroker
+from rasa.core.tracker_store import TrackerStore
+from rasa.shared.core.domain import Domain
+from rasa.shared.core.trackers import DialogueStateTracker
+
+from .event_log import EventLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB = "trackers.db"
+
+
+class SQLiteTrackerStore(TrackerStore):
+    """Stores conversations in SQLite (WAL mode), appending each save's new events as one compressed chunk."""
+
+    def __init__(self, domain: Optional[Domain] = None, host: Optional[Text] = None, db: Optional[Text] = None,
+                 retention_days: float = 30, keep_sessions: int = 0, pool_size: int = 4,
+                 event_broker: Optional[EventBroker] = None, **kwargs: Any) -> None:
+        super().__init__(domain, event_broker, **kwargs)
+        # `host` is the endpoint's `url`, accepted as the path too
+        path = db or host or os.getenv("TRACKER_STORE_DB", DEFAULT_DB)
+        self.log = EventLog(path, retention_days=float(retention_days), keep_sessions=int(keep_sessions))
+        self._executor = ThreadPoolExecutor(max_workers=int(pool_size), thread_name_prefix="tracker-store")
+        logger.debug("SQLite tracker store at %s", path)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def save(self, tracker: DialogueStateTracker) -> None:
+        await self.stream_events(tracker)
+        first = tracker.events[0].as_dict() if tracker.events else None
+        stored = await self._run(self.log.stored, tracker.sender_id, first)
+        # Only events after the ones already stored are serialized and written
+        new_events = [event.as_dict() for event in itertools.islice(tracker.events, stored, None)]
+        if new_events:
+            await self._run(self.log.append, tracker.sender_id, new_events)
+
+    async def retrieve(self, sender_id: Text) -> Optional[DialogueStateTracker]:
+        """The conversation's latest session, like Rasa's SQL tracker store."""
+        return await self._retrieve(sender_id, full=False)
+
+    async def retrieve_full_tracker(self, conversation_id: Text) -> Optional[DialogueStateTracker]:
+        return await self._retrieve(conversation_id, full=True)
+
+    async def _retrieve(self, sender_id: Text, full: bool) -> Optional[DialogueStateTracker]:
+        events = await self._run(self.log.load, sender_id, full)
+        if events is None:
+            return None
+        return DialogueStateTracker.from_dict(sender_id, events, self.domain.slots if self.domain else [])
+
+    async def exists(self, conversation_id: Text) -> bool:
+        return await self._run(self.log.exists, conversation_id)
+
+    async def keys(self) -> Iterable[Text]:
+        return await self._run(self.log.senders)
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# scripts/benchmark_actions.py
+# Micro-benchmarks for the action server hot paths, run in-process with real Tracker and
+# CollectingDispatcher objects (no Rasa server, no trained model).
+#
+#   python scripts/benchmark_actions.py                          # print results
+#   python scripts/benchmark_actions.py --save bench.json        # record a baseline
+#   python scripts/benchmark_actions.py --compare bench.json     # exit 1 on a >20% slowdown
+#   python scripts/benchmark_actions.py --sizes 10,1000000 --filter recommend
+#
+# Engine benchmarks run once per synthetic catalog size; the comparison uses the median.
+
+import argparse
+import asyncio
+import atexit
+import fnmatch
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Keep the benchmark self-contained: no catalog watcher, a throwaway profile store
+_tmpdir = tempfile.mkdtemp(prefix="bench-actions-")
+atexit.register(shutil.rmtree, _tmpdir, ignore_errors=True)
+os.environ.setdefault("CATALOG_WATCH_INTERVAL", "0")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/profiles.db")
+
+import numpy as np  # noqa: E402
+from rasa_sdk import Tracker  # noqa: E402
+from rasa_sdk.executor import CollectingDispatcher  # noqa: E402
+
+from actions import actions as action_module  # noqa: E402
+from actions.catalog import Catalog  # noqa: E402
+from actions.recommendation_engine import CatalogSnapshot, RecommendationEngine  # noqa: E402
+from actions.taxonomy import SenderCache, get_taxonomy  # noqa: E402
+from actions.utils import format_courses, format_list  # noqa: E402
+from actions.validation import profile_validator  # noqa: E402
+
+DEFAULT_SIZES = "10,1000,10000,100000"
+
+DOMAINS = ["AI", "Web Development", "Cybersecurity", "Data Science", "Cloud", "Mobile", "Game Development", "DevOps"]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+PLATFORMS = ["Coursera", "Udemy", "edX", "fast.ai", "freeCodeCamp", "YouTube"]
+WORDS = ["python", "javascript", "machine learning", "deep learning", "networks", "security", "react",
+         "sql", "statistics", "docker", "kubernetes", "linux", "cloud", "apis", "testing", "design"]
+
+PROFILE = {"skills": ["Python", "SQL"], "interests": ["AI"], "learning_goal": "Learn deep learning"}
+SLOTS = {"name": "Bench", "degree": "Computer Engineering", "semester": "5", "gpa": "3.22",
+         "skills": ["Python"], "time_commitment": "2 hours", "interests": ["AI"],
+         "learning_goal": "Learn AI", "target_domain": "AI"}
+
+# Representative inputs per validator, cycled through on each call
+VALIDATE_INPUTS = {
+    "degree": ["computer engineering", "BSc Computer Science", "x"],
+    "semester": ["5", "5th", "fifth semester", "semester seven", "thirteen"],
+    "gpa": ["3.22", "7.5", "abc", "11"],
+    "skills": ["Python, SQL; Git", ["python", "react"], "pyhton, ml", ""],
+    "time_commitment": ["1 hour", "2 hours a day", None],
+    "interests": ["AI, Web Development", "Cybersecurity", ["AI"], "webdev", "machine lerning"],
+    "learning_goal": ["Learn AI", "  become a web developer  ", ""],
+}
+# One message that filled several form slots at once
+MULTI_SLOT_MESSAGE = {"semester": "fifth semester", "gpa": "3.5", "skills": "Python, SQL; Git"}
+FORM_DOMAIN = {"forms": {"profile_form": {"required_slots": list(VALIDATE_INPUTS)}},
+               "slots": {slot: {} for slot in VALIDATE_INPUTS}}
+
+
+# ============================================================================
+# Synthetic data
+# ============================================================================
+
+def synthetic_catalog(n_items, seed=0):
+    """A catalog of `n_items` items spread over DOMAINS, with the default learning paths."""
+    rng = random.Random(seed)
+    kinds = ["course"] * 6 + ["project"] * 3 + ["career"]
+    items = []
+    for i in range(n_items):
+        tags = rng.sample(WORDS, 3)
+        item = {"title": f"{tags[0].title()} {i}", "domain": DOMAINS[i % len(DOMAINS)], "tags": tags,
+                "kind": kinds[i % len(kinds)]}
+        if item["kind"] == "course":
+            item["level"] = rng.choice(LEVELS)
+            item["platform"] = rng.choice(PLATFORMS)
+        items.append(item)
+    return Catalog(items, action_module.recommendation_engine.catalog.learning_paths)
+
+
+def make_tracker(sender_id="bench_user", slots=None):
+    return Tracker(sender_id, dict(SLOTS if slots is None else slots), {"intent": {"name": "ask_learning_path"}},
+                   [], False, None, {}, "action_listen")
+
+
+# ============================================================================
+# Timing
+# ============================================================================
+
+def summarize(samples_ns):
+    samples = sorted(samples_ns)
+    p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+    return {
+        "rounds": len(samples),
+        "min_us": samples[0] / 1000,
+        "median_us": statistics.median(samples) / 1000,
+        "mean_us": statistics.fmean(samples) / 1000,
+        "p95_us": p95 / 1000,
+        "ops_per_s": 1e9 / statistics.fmean(samples) if samples else 0.0,
+    }
+
+
+def _rounds_for(first_ns, budget_s, min_rounds, max_rounds):
+    return max(min_rounds, min(max_rounds, int(budget_s * 1e9 / max(first_ns, 1))))
+
+
+def bench_sync(fn, budget_s, min_rounds=5, max_rounds=100000):
+    fn()  # warm-up
+    start = time.perf_counter_ns()
+    fn()
+    rounds = _rounds_for(time.perf_counter_ns() - start, budget_s, min_rounds, max_rounds)
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - start)
+    return summarize(samples)
+
+
+async def bench_async(fn, budget_s, min_rounds=5, max_rounds=100000):
+    await fn()
+    start = time.perf_counter_ns()
+    await fn()
+    rounds = _rounds_for(time.perf_counter_ns() - start, budget_s, min_rounds, max_rounds)
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        await fn()
+        samples.append(time.perf_counter_ns() - start)
+    return summarize(samples)
+
+
+# ============================================================================
+# Benchmarks
+# ============================================================================
+
+def cycle(values):
+    state = {"i": 0}
+
+    def next_value():
+        value = values[state["i"] % len(values)]
+        state["i"] += 1
+        return value
+    return next_value
+
+
+def engine_cases(engine):
+    """Sync benchmarks of RecommendationEngine.recommend_* against one catalog."""
+    return {
+        "recommend_courses[domain]": lambda: engine.recommend_courses("AI"),
+        "recommend_courses[domain+level]": lambda: engine.recommend_courses("AI", "Beginner"),
+        "recommend_courses[profile]": lambda: engine.recommend_courses("AI", "Beginner", PROFILE),
+        "recommend_courses[off-catalog]": lambda: engine.recommend_courses("quantum computing", None, PROFILE),
+        "recommend_projects[profile]": lambda: engine.recommend_projects("Web Development", PROFILE),
+        "recommend_career[off-catalog]": lambda: engine.recommend_career("machine learning", PROFILE),
+        "plan_learning_path": lambda: engine.plan_learning_path("AI", "2 hours", ["python"]),
+    }
+
+
+def action_cases():
+    """Async benchmarks of action coroutines, with real Tracker and CollectingDispatcher objects."""
+    cases = {}
+    learning_path = action_module.ActionRecommendLearningPath()
+    tracker = make_tracker()
+
+    async def run_learning_path():
+        await learning_path.run(CollectingDispatcher(), tracker, {})
+    cases["ActionRecommendLearningPath.run"] = run_learning_path
+
+    form = action_module.ValidateProfileForm()
+    for slot, values in VALIDATE_INPUTS.items():
+        validate = getattr(form, f"validate_{slot}")
+        next_value = cycle(values)
+
+        async def run_validate(validate=validate, next_value=next_value):
+            await validate(next_value(), CollectingDispatcher(), tracker, {})
+        cases[f"ValidateProfileForm.validate_{slot}"] = run_validate
+
+    events = [{"event": "slot", "name": name, "value": value} for name, value in MULTI_SLOT_MESSAGE.items()]
+
+    async def run_form():
+        form_tracker = Tracker("bench_user", dict(MULTI_SLOT_MESSAGE, requested_slot="semester"),
+                               {"intent": {"name": "inform"}}, events, False, None,
+                               {"name": "profile_form"}, "action_listen")
+        await form.get_validation_events(CollectingDispatcher(), form_tracker, FORM_DOMAIN)
+    cases["ValidateProfileForm.get_validation_events[3 slots]"] = run_form
+    return cases
+
+
+def validation_cases():
+    """Sync benchmarks of the slot rule table: one case per slot, plus a multi-slot message."""
+    cases = {}
+    for slot, values in VALIDATE_INPUTS.items():
+        next_value = cycle(values)
+        cases[f"rule[{slot}]"] = lambda slot=slot, next_value=next_value: profile_validator.validate_slot(
+            slot, next_value())
+    cases["validate[3 slots]"] = lambda: profile_validator.validate(MULTI_SLOT_MESSAGE)
+    return cases
+
+
+# Free-text skills and interests: exact aliases, typos and phrases
+TAXONOMY_INPUTS = {
+    "exact": ("skill", "python"),
+    "alias": ("domain", "webdev"),
+    "typo": ("domain", "artifical inteligence"),
+    "phrase": ("skill", "basic pyhton and some machine lerning"),
+}
+
+
+def taxonomy_cases():
+    """The matcher on warm corrections, a cold typo correction, and a per-sender cache hit."""
+    taxonomy = get_taxonomy()
+    cases = {f"find[{name}]": lambda kind=kind, text=text: taxonomy.find(kind, text)
+             for name, (kind, text) in TAXONOMY_INPUTS.items()}
+
+    index = taxonomy._indexes["skill"]
+
+    def cold_typo():
+        index._corrections.pop("pyhton", None)
+        return taxonomy.find("skill", "pyhton")
+    cases["find[typo, cold]"] = cold_typo
+
+    senders = SenderCache()
+    profile = {"skills": ["pyhton", "ml", "SQL"], "interests": ["webdev"], "target_domain": "machine learning"}
+    cases["SenderCache.normalize_profile[hit]"] = lambda: senders.normalize_profile("bench_user", profile)
+    return cases
+
+
+def format_cases(catalog):
+    courses = [catalog.items[i] for i in catalog.ids_of_kind("course")[:100]]
+    titles = [c["title"] for c in courses]
+    return {
+        "format_list[5]": lambda: format_list(titles[:5]),
+        "format_list[100]": lambda: format_list(titles),
+        "format_courses[5]": lambda: format_courses(courses[:5]),
+        "format_courses[100]": lambda: format_courses(courses),
+    }
+
+
+async def run_benchmarks(args):
+    wanted = lambda name: not args.filter or any(fnmatch.fnmatch(name, f"*{f}*") for f in args.filter)
+    results = {}
+
+    def record(name, result):
+        results[name] = result
+        print(f"{name:<58} {result['median_us']:>11.1f} {result['p95_us']:>11.1f} {result['ops_per_s']:>12.0f}")
+
+    print(f"{'benchmark':<58} {'median µs':>11} {'p95 µs':>11} {'ops/s':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        start = time.perf_counter()
+        catalog = synthetic_catalog(size)
+        engine = RecommendationEngine(catalog)
+        print(f"-- catalog of {size} items (built in {time.perf_counter() - start:.2f}s)")
+        for name, fn in engine_cases(engine).items():
+            full = f"engine/{name}@{size}"
+            if wanted(full):
+                record(full, bench_sync(fn, args.budget))
+
+        # Actions read the module-level engine, so point it at this catalog for the action runs
+        previous = action_module.recommendation_engine.swap(CatalogSnapshot(catalog))
+        try:
+            full = f"action/ActionRecommendLearningPath.run@{size}"
+            if wanted(full):
+                record(full, await bench_async(action_cases()["ActionRecommendLearningPath.run"], args.budget))
+        finally:
+            action_module.recommendation_engine.swap(previous)
+
+    print("-- size-independent")
+    for name, fn in action_cases().items():
+        full = f"action/{name}"
+        if name != "ActionRecommendLearningPath.run" and wanted(full):
+            record(full, await bench_async(fn, args.budget))
+    for name, fn in validation_cases().items():
+        full = f"validation/{name}"
+        if wanted(full):
+            record(full, bench_sync(fn, args.budget))
+    for name, fn in taxonomy_cases().items():
+        full = f"taxonomy/{name}"
+        if wanted(full):
+            record(full, bench_sync(fn, args.budget))
+    for name, fn in format_cases(synthetic_catalog(1000)).items():
+        full = f"utils/{name}"
+        if wanted(full):
+            record(full, bench_sync(fn, args.budget))
+
+    await action_module.profile_writer.close()
+    return results
+
+
+# ============================================================================
+# Baselines
+# ============================================================================
+
+def environment():
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "platform": platform.platform(), "numpy": np.__version__, "cpus": os.cpu_count()}
+
+
+def compare(results, baseline, threshold):
+    """Print the change against `baseline` per benchmark; return the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<58} {'baseline µs':>12} {'now µs':>11} {'change':>9}")
+    for name, result in sorted(results.items()):
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            print(f"{name:<58} {'-':>12} {result['median_us']:>11.1f}      new")
+            continue
+        change = result["median_us"] / before["median_us"] - 1.0 if before["median_us"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<58} {before['median_us']:>12.1f} {result['median_us']:>11.1f} {change:>+9.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the action server hot paths")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"catalog sizes (default {DEFAULT_SIZES})")
+    parser.add_argument("--budget", type=float, default=0.5, help="approximate seconds per benchmark")
+    parser.add_argument("--filter", action="append", help="only run benchmarks whose name contains this")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="compare against a JSON baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed median slowdown before --compare fails (default 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args))
+
+    if args.save:
+        Path(args.save).write_text(json.dumps({"environment": environment(), "results": results}, indent=2))
+        print(f"\nSaved {len(results)} results to {args.save}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if baseline.get("environment") != environment():
+            print("\nWarning: baseline was recorded on a different environment:", baseline.get("environment"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == '__main__':
+    main()
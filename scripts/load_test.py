@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# scripts/load_test.py
+# Replay many concurrent synthetic conversations against the Rasa REST channel and report latency.
+#
+# Conversations are built from the stories in data/stories.yml and tests/test_stories.yml.
+# User turns use the story's own text when there is one, otherwise an example of the intent
+# from data/nlu.yml; the profile form is filled with the same answers as test_rasa_conversation.py.
+#
+#   python scripts/load_test.py --conversations 2000 --concurrency 200
+#   python scripts/load_test.py --stub            # no trained model needed
+#
+# Needs aiohttp and PyYAML.
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import aiohttp
+import yaml
+from aiohttp import web
+
+from test_rasa_conversation import messages as FORM_MESSAGES
+
+ROOT = Path(__file__).resolve().parent.parent
+STORY_FILES = [ROOT / "data" / "stories.yml", ROOT / "tests" / "test_stories.yml"]
+NLU_FILE = ROOT / "data" / "nlu.yml"
+WEBHOOK = "/webhooks/rest/webhook"
+
+# Answers to the profile form questions, in the order the form asks them
+FORM_ANSWERS = FORM_MESSAGES[2:]
+
+
+# ============================================================================
+# Conversations
+# ============================================================================
+
+def load_examples(path=NLU_FILE):
+    """Map each intent to its training examples."""
+    data = yaml.safe_load(path.read_text()) or {}
+    examples = {}
+    for block in data.get("nlu", []):
+        if "intent" in block:
+            lines = [l.strip()[2:] for l in block.get("examples", "").splitlines() if l.strip().startswith("- ")]
+            examples[block["intent"]] = [l for l in lines if l]
+    return examples
+
+
+def load_stories(paths=STORY_FILES):
+    """Turn every story into a list of turns: {"intent", "text", "actions"}.
+
+    An active profile_form loop expands into one "inform" turn per form answer.
+    """
+    stories = []
+    for path in paths:
+        data = yaml.safe_load(path.read_text()) or {}
+        for story in data.get("stories", []):
+            turns = []
+            for step in story.get("steps", []):
+                if "intent" in step:
+                    turns.append({"intent": step["intent"], "text": (step.get("user") or "").strip() or None,
+                                  "actions": []})
+                elif "action" in step and turns:
+                    turns[-1]["actions"].append(step["action"])
+                elif step.get("active_loop") and turns:
+                    for answer in FORM_ANSWERS:
+                        turns.append({"intent": "inform", "text": answer, "actions": [step["active_loop"]]})
+            if turns:
+                stories.append({"name": f"{path.name}: {story.get('story')}", "turns": turns})
+    return stories
+
+
+def make_conversation(story, examples, rng):
+    """Concrete (intent, action, text) turns for one synthetic user following `story`."""
+    conversation = []
+    for turn in story["turns"]:
+        text = turn["text"] or rng.choice(examples.get(turn["intent"]) or [turn["intent"]])
+        action = turn["actions"][0] if turn["actions"] else "(none)"
+        conversation.append((turn["intent"], action, text))
+    return conversation
+
+
+# ============================================================================
+# Stats
+# ============================================================================
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {"intent": defaultdict(list), "action": defaultdict(list)}
+        self.errors = {"intent": defaultdict(int), "action": defaultdict(int)}
+        self.error_kinds = defaultdict(int)
+        self.requests = 0
+        self.conversations = 0
+
+    def record(self, intent, action, seconds, error=None):
+        self.requests += 1
+        for group, key in (("intent", intent), ("action", action)):
+            self.latencies[group][key].append(seconds)
+            if error:
+                self.errors[group][key] += 1
+        if error:
+            self.error_kinds[error] += 1
+
+    def table(self, group):
+        rows = []
+        for key in sorted(self.latencies[group]):
+            values = sorted(self.latencies[group][key])
+            rows.append({
+                group: key,
+                "requests": len(values),
+                "errors": self.errors[group][key],
+                "error_rate": self.errors[group][key] / len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+            })
+        return rows
+
+    def report(self, elapsed):
+        all_values = sorted(v for values in self.latencies["intent"].values() for v in values)
+        errors = sum(self.error_kinds.values())
+        return {
+            "conversations": self.conversations,
+            "requests": self.requests,
+            "elapsed_s": elapsed,
+            "throughput_rps": self.requests / elapsed if elapsed else 0.0,
+            "errors": errors,
+            "error_rate": errors / self.requests if self.requests else 0.0,
+            "error_kinds": dict(self.error_kinds),
+            "p50_ms": percentile(all_values, 50) * 1000,
+            "p95_ms": percentile(all_values, 95) * 1000,
+            "p99_ms": percentile(all_values, 99) * 1000,
+            "by_intent": self.table("intent"),
+            "by_action": self.table("action"),
+        }
+
+
+def print_report(report):
+    print(f"\n{report['conversations']} conversations, {report['requests']} requests in {report['elapsed_s']:.1f}s "
+          f"({report['throughput_rps']:.1f} req/s)")
+    print(f"errors: {report['errors']} ({report['error_rate']:.2%}) {report['error_kinds'] or ''}")
+    print(f"latency: p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms")
+    for group in ("intent", "action"):
+        print(f"\n{group:<34} {'reqs':>7} {'err%':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for row in report[f"by_{group}"]:
+            print(f"{row[group]:<34} {row['requests']:>7} {row['error_rate']:>7.2%} "
+                  f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}")
+
+
+# ============================================================================
+# Load generator
+# ============================================================================
+
+async def run_conversation(session, base, sender, conversation, stats, args):
+    for intent, action, text in conversation:
+        start = time.perf_counter()
+        error = None
+        try:
+            async with session.post(base + WEBHOOK, json={"sender": sender, "message": text}) as r:
+                body = await r.read()
+                if r.status != 200:
+                    error = f"http_{r.status}"
+                elif args.require_reply and not json.loads(body or b"[]"):
+                    error = "empty_reply"
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except aiohttp.ClientError as e:
+            error = type(e).__name__
+        stats.record(intent, action, time.perf_counter() - start, error)
+        if args.think:
+            await asyncio.sleep(random.uniform(0, 2 * args.think))
+    stats.conversations += 1
+
+
+async def run_load(base, args):
+    examples = load_examples()
+    stories = load_stories()
+    if not stories:
+        sys.exit("No stories found")
+    rng = random.Random(args.seed)
+    stats = Stats()
+
+    # One pooled session; the connector limit keeps open sockets at the concurrency level
+    connector = aiohttp.TCPConnector(limit=args.concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    limiter = asyncio.Semaphore(args.concurrency)
+
+    async def one(i, session):
+        story = stories[i % len(stories)] if args.round_robin else rng.choice(stories)
+        conversation = make_conversation(story, examples, rng)
+        async with limiter:
+            await run_conversation(session, base, f"{args.sender_prefix}{i}", conversation, stats, args)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i, session) for i in range(args.conversations)))
+        elapsed = time.perf_counter() - start
+    return stats.report(elapsed)
+
+
+# ============================================================================
+# Stub server
+# ============================================================================
+
+def start_stub(latency_ms, error_rate, port=0):
+    """Start a tiny stand-in for the Rasa REST channel on its own thread and event loop.
+
+    Keeping it off the client's loop means the stub's work does not show up as client latency.
+    Returns (base_url, stop).
+    """
+    rng = random.Random(0)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    state = {}
+
+    async def webhook(request):
+        payload = await request.json()
+        await asyncio.sleep(rng.expovariate(1000.0 / latency_ms) if latency_ms > 0 else 0)
+        if rng.random() < error_rate:
+            return web.json_response({"error": "stub failure"}, status=500)
+        return web.json_response([{"recipient_id": payload.get("sender"), "text": f"echo: {payload.get('message')}"}])
+
+    async def serve():
+        app = web.Application()
+        app.router.add_post(WEBHOOK, webhook)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", port, backlog=1024)
+        await site.start()
+        state["runner"] = runner
+        state["port"] = runner.addresses[0][1]
+        started.set()
+
+    def run():
+        loop.run_until_complete(serve())
+        loop.run_forever()
+        loop.run_until_complete(state["runner"].cleanup())
+        loop.close()
+
+    thread = threading.Thread(target=run, name="stub-server", daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return f"http://127.0.0.1:{state['port']}", stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the Rasa REST channel")
+    parser.add_argument("--base", default="http://localhost:5005", help="Rasa server URL")
+    parser.add_argument("--conversations", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100, help="conversations in flight at once")
+    parser.add_argument("--think", type=float, default=0.0, help="mean seconds between turns of one conversation")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--round-robin", action="store_true", help="cycle through stories instead of sampling")
+    parser.add_argument("--require-reply", action="store_true", help="count empty bot replies as errors")
+    parser.add_argument("--sender-prefix", default="load_user_")
+    parser.add_argument("--stub", action="store_true", help="run against a local stub server instead of Rasa")
+    parser.add_argument("--stub-latency", type=float, default=20.0, help="stub mean latency in ms")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    base, stop = args.base, None
+    if args.stub:
+        base, stop = start_stub(args.stub_latency, args.stub_error_rate)
+    print(f"Replaying {args.conversations} conversations against {base} (concurrency {args.concurrency})")
+    try:
+        report = asyncio.run(run_load(base, args))
+    finally:
+        if stop is not None:
+            stop()
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,18 @@ Learning Advisor Chatbot - Streamlit Frontend
 A professional, ChatGPT-style interface for the Rasa chatbot.
 """
 
+import json
 import os
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import uuid
 import time
 
+from conversation_store import ConversationStore
+from router import LOCAL, default_router
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -17,6 +23,10 @@ RASA_API_URL = os.getenv(
     "RASA_API_URL",
     "https://personalized-learning-advisor-rasa.onrender.com/webhooks/rest/webhook"
 )
+# Seconds a server status check is reused across reruns and sessions
+HEALTH_TTL = int(os.getenv("RASA_HEALTH_TTL", "15"))
+# Messages shown per page of chat history; "Show earlier" reveals another page
+RENDER_WINDOW = int(os.getenv("CHAT_RENDER_WINDOW", "50"))
 APP_TITLE = "Learning Advisor"
 APP_ICON = "🎓"
 
@@ -213,25 +223,57 @@ st.markdown("""
 # Session State
 # ============================================================================
 
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+@st.cache_resource
+def get_conversation_store() -> ConversationStore:
+    """Process-wide store that keeps each session's newest messages in memory and the rest on disk."""
+    return ConversationStore()
 
 if "session_id" not in st.session_state:
     st.session_state.session_id = str(uuid.uuid4())
 
+if "messages" not in st.session_state:
+    st.session_state.messages = get_conversation_store().conversation(st.session_state.session_id)
+
+if "render_window" not in st.session_state:
+    st.session_state.render_window = RENDER_WINDOW
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """One pooled keep-alive session shared by every rerun and browser session.
+
+    A 503 from the proxy means Rasa is still loading the model and did not
+    handle the message, so POSTs are retried on it with exponential backoff
+    (honouring Retry-After). The last 503 is returned rather than raised.
+    """
+    retry = Retry(
+        total=3,
+        connect=1,
+        read=0,
+        status_forcelist=[503],
+        allowed_methods=frozenset(["POST"]),
+        backoff_factor=0.5,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_data(ttl=HEALTH_TTL, show_spinner=False)
 def check_server_status():
-    """Check if Rasa server is online and ready."""
+    """Check if Rasa server is online and ready (cached for HEALTH_TTL seconds)."""
     try:
         # Ping the Rasa server base URL (not the webhook path) to check availability
         ping_url = RASA_API_URL
         # If webhook path present, try root
         if ping_url.endswith('/webhooks/rest/webhook'):
             ping_url = ping_url.replace('/webhooks/rest/webhook', '/')
-        response = requests.get(ping_url, timeout=5)
+        response = get_http_session().get(ping_url, timeout=5)
         # Check if server is still loading (503 from our proxy)
         if response.status_code == 503:
             return "loading"
@@ -239,93 +281,119 @@ def check_server_status():
     except:
         return False
 
-def send_message_to_rasa(message: str) -> list:
-    """Send message to Rasa and get response."""
+def send_message_to_rasa(message: str):
+    """Send message to Rasa and yield its responses as they arrive.
+
+    Uses the REST channel's streaming mode (`?stream=true`), which writes each
+    bot message as its own JSON line as soon as it is ready, so the first
+    message can be shown before the whole turn has finished.
+    """
     try:
         payload = {
             "sender": st.session_state.session_id,
             "message": message
         }
-        response = requests.post(RASA_API_URL, json=payload, timeout=30)
+        response = get_http_session().post(RASA_API_URL, params={"stream": "true"}, json=payload,
+                                           timeout=(5, 30), stream=True)
         
         # Handle 503 (Rasa still loading)
         if response.status_code == 503:
+            check_server_status.clear()
             try:
                 data = response.json()
                 if data.get("status") == "loading":
-                    return [{"text": "⏳ The Learning Advisor is still starting up. Please wait a moment and try again."}]
+                    yield {"text": "⏳ The Learning Advisor is still starting up. Please wait a moment and try again."}
+                    return
             except:
                 pass
-            return [{"text": "⏳ Server is loading, please try again in a few seconds."}]
+            yield {"text": "⏳ Server is loading, please try again in a few seconds."}
+            return
         
         response.raise_for_status()
-        result = response.json()
+        received = 0
+        with response:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                result = json.loads(line)
+                # A proxy that does not stream sends the usual single JSON list
+                for r in (result if isinstance(result, list) else [result]):
+                    received += 1
+                    yield r
         
         # If empty response, Rasa might not have a model loaded
-        if not result:
-            return [{"text": "🤔 I received your message but couldn't generate a response. The server might still be initializing."}]
-        
-        return result
+        if not received:
+            yield {"text": "🤔 I received your message but couldn't generate a response. The server might still be initializing."}
     except requests.exceptions.Timeout:
-        return [{"text": "⏱️ Request timed out. The server might be busy loading. Please try again."}]
+        yield {"text": "⏱️ Request timed out. The server might be busy loading. Please try again."}
     except requests.exceptions.ConnectionError:
-        return [{"text": "⚠️ Unable to connect to the Learning Advisor server. Please check if the server is running."}]
+        check_server_status.clear()
+        yield {"text": "⚠️ Unable to connect to the Learning Advisor server. Please check if the server is running."}
     except Exception as e:
-        return [{"text": f"⚠️ Error: Unable to connect to the Learning Advisor server."}]
-
-def is_closing_message(text: str) -> bool:
-    """Detect common 'thank you' / closing phrases so we can handle them locally.
-
-    This prevents the bot from re-sending the same 'profile ready' message when the
-    user just says thanks or a similar closing line.
-    """
-    if not text:
-        return False
-    t = text.strip().lower()
-    # Common one-word or short closers
-    closers = ["thank", "thanks", "thankyou", "thank you", "thx", "ty", "thanks!", "thank u"]
-    closers_short = ["its okay", "it's okay", "i'm okay", "im okay", "i am okay", "its fine", "no thanks", "no thank you"]
-    for c in closers:
-        if c in t:
-            return True
-    for c in closers_short:
-        if c in t:
-            return True
-    return False
-
-
-def handle_user_message(message: str) -> list:
+        yield {"text": f"⚠️ Error: Unable to connect to the Learning Advisor server."}
+
+@st.cache_resource
+def get_router():
+    """Local fast-path router shared by all sessions (its counters are process-wide)."""
+    return default_router()
+
+def last_bot_reply() -> str:
+    """Text of the previous bot reply, which may span several messages."""
+    parts = []
+    for m in reversed(st.session_state.messages):
+        if m.get("role") == "assistant":
+            parts.append(m.get("content", ""))
+        elif parts:
+            break
+    return "\n".join(reversed(parts))
+
+def _timed_replies(responses, router, kind):
+    """Pass responses through, then record the Rasa round trip once they are all consumed."""
+    started = time.perf_counter()
+    yield from responses
+    router.record(kind, time.perf_counter() - started)
+
+def handle_user_message(message: str):
     """Central handler for outgoing user messages.
 
-    If the message is a closing/thank-you phrase, handle it locally and return
-    a synthetic response list in the same format Rasa returns. Otherwise forward
-    to Rasa.
+    Greetings on a fresh session and thank-you/closing phrases are answered
+    locally (in the same format Rasa returns) and quick-action texts go to Rasa
+    as direct intents; see router.py. Everything else is forwarded to Rasa and
+    returned as an iterator over its responses as they stream in.
     """
-    # Intercept thank-you / closing phrases
-    if is_closing_message(message):
-        # Find last assistant message to tailor the reply a bit
-        last_bot = None
-        for m in reversed(st.session_state.messages):
-            if m.get("role") == "assistant":
-                last_bot = m.get("content", "")
-                break
-
-        # Craft polite local replies to avoid hitting Rasa and repeating the same utterance
-        if last_bot and "personalized learning path" in last_bot.lower():
-            reply = "You're welcome! Glad the learning path helped — anything else I can do?"
-        elif last_bot and "here is a recommended learning path" in last_bot.lower():
-            reply = "You're welcome! Happy learning — ask me for project ideas or resources anytime."
+    router = get_router()
+    context = {
+        # Rasa has not seen this session yet
+        "fresh": not st.session_state.get("rasa_turns"),
+        "last_bot": last_bot_reply(),
+    }
+    decision = router.route(message, context)
+    if decision.kind == LOCAL:
+        return decision.replies
+
+    st.session_state.rasa_turns = st.session_state.get("rasa_turns", 0) + 1
+    return _timed_replies(send_message_to_rasa(decision.payload), router, decision.kind)
+
+def render_message_html(message: dict) -> str:
+    """HTML for one chat bubble, rendered once and kept on the message."""
+    html = message.get("html")
+    if html is None:
+        content = message.get("content", "").replace("\n", "<br>")
+        if message.get("role", "assistant") == "user":
+            html = (f'<div class="message-row user"><div class="message-bubble user">{content}</div>'
+                    f'<div class="avatar user">👤</div></div>')
         else:
-            reply = "You're welcome — happy to help! Let me know if you'd like anything else."
-
-        return [{"text": reply}]
-
-    # Not a closing phrase — forward to Rasa
-    return send_message_to_rasa(message)
+            html = (f'<div class="message-row bot"><div class="avatar bot">🎓</div>'
+                    f'<div class="message-bubble bot">{content}</div></div>')
+        message["html"] = html
+    return html
 
 def clear_chat():
-    st.session_state.messages = []
+    st.session_state.messages.close()
     st.session_state.session_id = str(uuid.uuid4())
+    st.session_state.messages = get_conversation_store().conversation(st.session_state.session_id)
+    st.session_state.rasa_turns = 0
+    st.session_state.render_window = RENDER_WINDOW
 
 # ============================================================================
 # Sidebar
@@ -353,6 +421,15 @@ with st.sidebar:
     </div>
     """
     st.markdown(status_html, unsafe_allow_html=True)
+
+    if "last_timing" in st.session_state:
+        first_message, total = st.session_state.last_timing
+        st.caption(f"Last reply: first message in {first_message * 1000:.0f} ms, complete in {total * 1000:.0f} ms")
+
+    routing = get_router().stats()
+    if routing["messages"]:
+        st.caption(f"Answered locally: {routing['local_fraction']:.0%} of {routing['messages']} messages "
+                   f"({routing['avg_ms']['local']:.2f} ms vs {routing['avg_ms']['rasa']:.0f} ms via Rasa)")
     
     st.markdown("---")
     
@@ -407,26 +484,18 @@ if not st.session_state.messages:
     </div>
     """, unsafe_allow_html=True)
 
-st.markdown('<div class="chat-wrapper">', unsafe_allow_html=True)
-for message in st.session_state.messages:
-    role = message.get("role", "assistant")
-    content = message.get("content", "").replace("\n", "<br>")
-    
-    if role == "user":
-        st.markdown(f"""
-        <div class="message-row user">
-            <div class="message-bubble user">{content}</div>
-            <div class="avatar user">👤</div>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div class="message-row bot">
-            <div class="avatar bot">🎓</div>
-            <div class="message-bubble bot">{content}</div>
-        </div>
-        """, unsafe_allow_html=True)
-st.markdown('</div>', unsafe_allow_html=True)
+# Only the newest render_window messages are drawn, as one HTML block built from
+# per-message cached HTML, so a rerun costs the same however long the chat gets.
+# Older pages are read back from the conversation store only when asked for.
+messages = st.session_state.messages
+hidden = max(0, len(messages) - st.session_state.render_window)
+if hidden:
+    if st.button(f"Show earlier messages ({hidden} hidden)", use_container_width=True):
+        st.session_state.render_window += RENDER_WINDOW
+        st.rerun()
+if messages:
+    st.markdown('<div class="chat-wrapper">' + "\n".join(render_message_html(m) for m in messages.tail(st.session_state.render_window)) + '</div>',
+                unsafe_allow_html=True)
 
 # Chat Input
 if prompt := st.chat_input("Message Learning Advisor..."):
@@ -435,25 +504,25 @@ if prompt := st.chat_input("Message Learning Advisor..."):
     with st.chat_message("user", avatar="👤"):
         st.markdown(prompt)
 
-    # Generate response
+    # Generate response, rendering each bot message as soon as it arrives
     with st.chat_message("assistant", avatar="🎓"):
         message_placeholder = st.empty()
+        message_placeholder.markdown("▌")
         full_response = ""
-        
-        with st.spinner("Thinking..."):
-            responses = handle_user_message(prompt)
+        started = time.perf_counter()
+        first_message = None
 
-            for r in responses:
-                if "text" in r:
-                    text_chunk = r["text"]
-                    full_response += text_chunk + "\n\n"
-                    # Simulate typing effect
-                    message_placeholder.markdown(full_response + "▌")
-                    time.sleep(0.01)
+        for r in handle_user_message(prompt):
+            if first_message is None:
+                first_message = time.perf_counter() - started
+            if "text" in r:
+                full_response += r["text"] + "\n\n"
+                message_placeholder.markdown(full_response + "▌")
 
-                if "image" in r:
-                    st.image(r["image"])
+            if "image" in r:
+                st.image(r["image"])
 
-            message_placeholder.markdown(full_response)
+        message_placeholder.markdown(full_response)
+        st.session_state.last_timing = (first_message or 0.0, time.perf_counter() - started)
     
     st.session_state.messages.append({"role": "assistant", "content": full_response})
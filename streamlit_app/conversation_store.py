@@ -0,0 +1,189 @@
+"""
+Bounded in-memory chat history with SQLite offload.
+
+Each browser session keeps only its newest messages in memory. Older ones
+are appended to a local SQLite file keyed by session_id and read back only
+when the user pages back through the history. A per-process cap on the
+total number of in-memory messages spills the least recently active
+sessions first: down to MIN_MESSAGES each, then, if that is not enough,
+entirely.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Deque, Dict, Iterator, List
+
+# Newest messages each session keeps in memory
+MEMORY_MESSAGES = int(os.getenv("CHAT_MEMORY_MESSAGES", "100"))
+# In-memory messages across all sessions of this Streamlit process
+MEMORY_MAX_MESSAGES = int(os.getenv("CHAT_MEMORY_MAX_MESSAGES", "20000"))
+STORE_PATH = os.getenv("CHAT_STORE_PATH", "chat_history.db")
+# Offloaded history older than this is deleted when the store opens
+RETENTION_DAYS = float(os.getenv("CHAT_STORE_RETENTION_DAYS", "7"))
+# A session squeezed by the process cap keeps this many messages in memory, unless even that is over the cap
+MIN_MESSAGES = 10
+
+
+class Conversation:
+    """One session's messages: the newest in memory, the rest in the store.
+
+    Behaves like the list it replaces for appending, `len`, truth testing and
+    iterating (in-memory messages only); use `tail(n)` to read the newest n
+    messages including offloaded ones.
+    """
+
+    def __init__(self, store: "ConversationStore", session_id: str, keep: int):
+        self.store = store
+        self.session_id = session_id
+        self.keep = keep
+        self.last_active = time.monotonic()
+        self._recent: List[dict] = []
+        self._spilled = 0
+        self._lock = threading.Lock()
+        # Returns the in-memory count to the store when the session is dropped without `close`.
+        # It may run inside garbage collection on any thread, so it must not take a lock.
+        self._finalizer = weakref.finalize(self, store._released.append, self._recent)
+
+    def append(self, message: dict):
+        with self._lock:
+            self._recent.append(message)
+            self.last_active = time.monotonic()
+            # Spill in batches so we write once per batch rather than once per message
+            excess = len(self._recent) - self.keep
+            if excess >= max(1, self.keep // 4):
+                self._spill(excess)
+        self.store._track(1)
+
+    def spill_to(self, keep: int) -> int:
+        """Offload all but the newest `keep` in-memory messages; returns how many were offloaded."""
+        with self._lock:
+            return self._spill(len(self._recent) - keep)
+
+    def _spill(self, n: int) -> int:
+        if n <= 0:
+            return 0
+        self.store._write(self.session_id, self._spilled, self._recent[:n])
+        self._spilled += n
+        del self._recent[:n]
+        self.store._release(n)
+        return n
+
+    def tail(self, n: int) -> List[dict]:
+        """The newest n messages, reading offloaded ones back from the store when needed."""
+        with self._lock:
+            recent = list(self._recent)
+            spilled = self._spilled
+        if n <= len(recent):
+            return recent[len(recent) - n:]
+        older = self.store._read(self.session_id, max(0, spilled - (n - len(recent))), spilled)
+        return older + recent
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(list(self._recent))
+
+    def __reversed__(self) -> Iterator[dict]:
+        return reversed(list(self._recent))
+
+    def close(self):
+        """Drop the in-memory messages and give their share of the budget back, e.g. when the chat is cleared."""
+        if self._finalizer.detach() is None:
+            return
+        with self._lock:
+            n = len(self._recent)
+            self._recent.clear()
+        self.store._release(n)
+
+
+class ConversationStore:
+    """Process-wide owner of the SQLite file and the in-memory message budget."""
+
+    def __init__(self, path: str = STORE_PATH, keep: int = MEMORY_MESSAGES, max_messages: int = MEMORY_MAX_MESSAGES):
+        self.path = path
+        self.keep = keep
+        self.max_messages = max_messages
+        self.in_memory = 0
+        self._lock = threading.Lock()
+        self._conversations: "weakref.WeakSet[Conversation]" = weakref.WeakSet()
+        # In-memory message lists of conversations that were garbage collected, not yet subtracted
+        self._released: Deque[List[dict]] = deque()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            " session_id TEXT NOT NULL, seq INTEGER NOT NULL, role TEXT NOT NULL, content TEXT NOT NULL,"
+            " created REAL NOT NULL, html TEXT, PRIMARY KEY (session_id, seq))"
+        )
+        # Files written before rendered HTML was kept alongside each message
+        if "html" not in {row[1] for row in self._db.execute("PRAGMA table_info(messages)")}:
+            self._db.execute("ALTER TABLE messages ADD COLUMN html TEXT")
+        if RETENTION_DAYS > 0:
+            self._db.execute("DELETE FROM messages WHERE created < ?", (time.time() - RETENTION_DAYS * 86400,))
+
+    def conversation(self, session_id: str) -> Conversation:
+        conversation = Conversation(self, session_id, self.keep)
+        with self._lock:
+            self._conversations.add(conversation)
+        return conversation
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._collect_released()
+        return {"sessions": len(self._conversations), "in_memory_messages": self.in_memory}
+
+    def _write(self, session_id: str, first_seq: int, messages: List[dict]):
+        now = time.time()
+        # The rendered HTML goes along, so paging back does not render the message again
+        rows = [(session_id, first_seq + i, m.get("role", "assistant"), m.get("content", ""), now, m.get("html"))
+                for i, m in enumerate(messages)]
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO messages (session_id, seq, role, content, created, html)"
+                " VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def _read(self, session_id: str, start: int, end: int) -> List[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT role, content, html FROM messages WHERE session_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (session_id, start, end),
+            ).fetchall()
+        messages = []
+        for role, content, html in rows:
+            message = {"role": role, "content": content}
+            if html is not None:
+                message["html"] = html
+            messages.append(message)
+        return messages
+
+    def _collect_released(self):
+        # Caller holds self._lock
+        while self._released:
+            self.in_memory -= len(self._released.popleft())
+
+    def _release(self, n: int):
+        with self._lock:
+            self.in_memory -= n
+
+    def _track(self, added: int):
+        with self._lock:
+            self._collect_released()
+            self.in_memory += added
+            over = self.in_memory > self.max_messages
+            candidates = sorted(self._conversations, key=lambda c: c.last_active) if over else []
+        # Over budget: offload from the least recently active sessions first, down to MIN_MESSAGES
+        # each, and only if that is not enough, all of their in-memory messages
+        for keep in (MIN_MESSAGES, 0):
+            for conversation in candidates:
+                if self.in_memory <= self.max_messages:
+                    return
+                conversation.spill_to(keep)
@@ -0,0 +1,167 @@
+"""
+Local fast-path router for the Streamlit front-end.
+
+Messages that do not need the NLU model (greetings on a fresh session,
+thank-you/closing phrases, quick-action buttons) are answered locally or
+rewritten to a direct `/intent` payload. Everything else goes to Rasa
+unchanged. All route patterns are compiled into a single regex, so routing a
+message is one match whatever the number of routes.
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+LOCAL = "local"
+REWRITE = "rewrite"
+RASA = "rasa"
+
+
+@dataclass
+class Decision:
+    kind: str                      # LOCAL, REWRITE or RASA
+    route: Optional[str] = None
+    replies: List[dict] = field(default_factory=list)
+    payload: Optional[str] = None  # message to send to Rasa (REWRITE and RASA)
+
+
+@dataclass
+class Route:
+    name: str
+    pattern: str
+    reply: Optional[Callable[[str, dict], str]] = None
+    payload: Optional[str] = None
+    when: Optional[Callable[[dict], bool]] = None
+
+
+class LocalRouter:
+    """Routes messages by the first route whose pattern matches and whose `when` guard passes.
+
+    Patterns are matched with `re.search` against the stripped, lower-cased
+    message; anchor them with ^...$ to require a whole-message match. Local
+    answers are timed here; callers time REWRITE and RASA decisions over the
+    Rasa round trip and report them with `record`.
+    """
+
+    def __init__(self, routes: Optional[List[Route]] = None):
+        self.routes: List[Route] = []
+        self._matcher = None
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {LOCAL: 0, REWRITE: 0, RASA: 0}
+        self.route_counts: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {LOCAL: 0.0, REWRITE: 0.0, RASA: 0.0}
+        for route in routes or []:
+            self.add(route)
+
+    def add(self, route: Route):
+        self.routes.append(route)
+        # One alternation with a named group per route: the match tells us which route fired
+        self._matcher = re.compile("|".join(f"(?P<r{i}>{r.pattern})" for i, r in enumerate(self.routes)))
+
+    def route(self, message: str, context: Optional[dict] = None) -> Decision:
+        started = time.perf_counter()
+        context = context or {}
+        text = (message or "").strip().lower()
+        decision = Decision(RASA, payload=message)
+        route = self._match(text, context)
+        if route is not None:
+            if route.reply is not None:
+                decision = Decision(LOCAL, route.name, replies=[{"text": route.reply(text, context)}])
+            else:
+                decision = Decision(REWRITE, route.name, payload=route.payload)
+        if decision.kind == LOCAL:
+            self.record(LOCAL, time.perf_counter() - started, decision.route)
+        return decision
+
+    def _match(self, text: str, context: dict) -> Optional[Route]:
+        if not text or self._matcher is None:
+            return None
+        m = self._matcher.search(text)
+        if m is None:
+            return None
+        route = self.routes[int(m.lastgroup[1:])]
+        if route.when is None or route.when(context):
+            return route
+        # The first match was guarded out; try the remaining routes one by one
+        for later in self.routes[self.routes.index(route) + 1:]:
+            if re.search(later.pattern, text) and (later.when is None or later.when(context)):
+                return later
+        return None
+
+    def record(self, kind: str, seconds: float, route: Optional[str] = None):
+        with self._lock:
+            self.counts[kind] += 1
+            self.seconds[kind] += seconds
+            if route:
+                self.route_counts[route] = self.route_counts.get(route, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = sum(self.counts.values())
+            return {
+                "messages": total,
+                "local_fraction": self.counts[LOCAL] / total if total else 0.0,
+                "rewrite_fraction": self.counts[REWRITE] / total if total else 0.0,
+                "avg_ms": {k: self.seconds[k] / n * 1000 if n else 0.0 for k, n in self.counts.items()},
+                "routes": dict(self.route_counts),
+            }
+
+
+# ============================================================================
+# Default routes
+# ============================================================================
+
+# Same text as utter_greet in domain.yml
+GREETING = ("Hello! I am your Personalized Learning Advisor. I can help you with learning paths, "
+            "course recommendations, and career guidance. How can I help you today?")
+
+# Quick-action button texts and the intent each one maps to
+QUICK_ACTIONS = {
+    "I want to start my profile": "/tell_background",
+    "What should I learn next?": "/ask_learning_path",
+}
+
+# Same texts as the utter_ask_* responses of profile_form in domain.yml; the form
+# asks one of them again after a rejected answer, so it ends every in-form reply
+FORM_QUESTIONS = (
+    "What degree are you currently pursuing?",
+    "Which semester are you in?",
+    "What is your current GPA?",
+    "What are your current technical skills? (e.g., Python, Java, Basic ML)",
+    "How much time can you commit to learning daily?",
+    "What are your areas of interest? (e.g., AI, Web Development, Cybersecurity)",
+    "What is your primary learning goal?",
+)
+
+
+def form_active(context: dict) -> bool:
+    """Whether the previous bot reply ended with a profile_form question, i.e. the form is waiting for an answer."""
+    return (context.get("last_bot") or "").rstrip().endswith(FORM_QUESTIONS)
+
+
+def closing_reply(text: str, context: dict) -> str:
+    """Thank-you reply tailored to the previous bot reply, so Rasa does not repeat itself."""
+    last_bot = (context.get("last_bot") or "").lower()
+    if "personalized learning path" in last_bot:
+        return "You're welcome! Glad the learning path helped — anything else I can do?"
+    if "here is a recommended learning path" in last_bot:
+        return "You're welcome! Happy learning — ask me for project ideas or resources anytime."
+    return "You're welcome — happy to help! Let me know if you'd like anything else."
+
+
+def default_router() -> LocalRouter:
+    # Exact quick-action texts skip NLU and go straight to their intent, except while the
+    # form is asking: its from_text mappings would store the "/intent" payload as the answer
+    routes = [Route(f"quick_action{payload}", f"^{re.escape(text.lower())}$", payload=payload,
+                    when=lambda context: not form_active(context))
+              for text, payload in QUICK_ACTIONS.items()]
+    return LocalRouter(routes + [
+        Route("closer", r"\bthank|\bthx\b|\bty\b|\bno thank|\b(?:its|it's|i'm|im|i am) okay\b|\bits fine\b",
+              reply=closing_reply),
+        # A bare greeting on a session Rasa has not seen yet: nothing to reset, so answer it here
+        Route("greeting", r"^(?:hi|hello|hey|hey there|good (?:morning|afternoon|evening))[!. ]*$",
+              reply=lambda text, context: GREETING,
+              when=lambda context: context.get("fresh", False)),
+    ])
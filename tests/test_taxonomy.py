@@ -0,0 +1,49 @@
+import pytest
+
+from actions.taxonomy import get_taxonomy
+from actions.validation import profile_validator
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("none", []),
+    ("nope", []),
+    ("None so far", []),
+    ("rest", []),
+    ("REST APIs", ["REST APIs"]),
+    ("note taking", []),
+    ("pyhton", ["Python"]),
+    ("javascrpt", ["JavaScript"]),
+    ("ml, pyhton; Rust, Excel and Tableau", ["Machine Learning", "Python", "Rust", "Excel", "Tableau"]),
+    ("Python and Go", ["Python", "Go"]),
+])
+def test_normalize_skills(text, expected):
+    assert get_taxonomy().normalize("skill", [text]) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("aws, azure, gcp", ["AWS", "Azure", "Google Cloud"]),
+    ("kubernetes, k8s", ["Kubernetes"]),
+    ("keras", ["Keras"]),
+    ("bootstrap and tailwind", ["Bootstrap", "Tailwind CSS"]),
+    ("shell scripting", ["Shell Scripting"]),
+    ("Next.js", ["Next.js"]),
+    ("Vue.js", ["Vue.js"]),
+    ("Nuxt.js", ["Nuxt.js"]),
+    ("node.js", ["Node.js"]),
+])
+def test_tools_keep_their_own_names(text, expected):
+    assert get_taxonomy().normalize("skill", [text]) == expected
+
+
+def test_domain_typos_are_corrected():
+    assert get_taxonomy().normalize("domain", ["web developement"]) == ["Web Development"]
+
+
+def test_form_does_not_store_negations_as_skills():
+    values, messages = profile_validator.validate({"skills": "ml, none"})
+    assert values == {"skills": ["Machine Learning"]}
+    assert messages == []
+
+    values, messages = profile_validator.validate({"skills": "none"})
+    assert values == {"skills": None}
+    assert messages == ["Please list at least one technical skill you have."]